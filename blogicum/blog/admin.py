@@ -1,35 +1,115 @@
+import hashlib
+
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Count
+from django.db.models.functions import Substr
+from django.urls import reverse
+from django.utils.html import format_html
+
+from blog.constants import ADMIN_DATES_TIMEOUT, TEXT_PREVIEW_LENGTH
+from blog.models import Category, Location, Post, PostQuerySet, Comment
+from blog.paginators import EstimatedCountPaginator
+from blog.search import fts_available, matching_ids, to_fts_query
+
+
+class CachedDatesQuerySet(PostQuerySet):
+    """Публикации в списке админки: кэширует запросы иерархии дат."""
+
+    def _cached(self, method, *args, **kwargs):
+        parent = super()
+
+        def compute():
+            result = getattr(parent, method)(*args, **kwargs)
+            return result if isinstance(result, dict) else list(result)
+
+        try:
+            sql = str(self.query)
+        except EmptyResultSet:
+            return compute()
+        key = 'admin_dates:' + hashlib.md5(
+            f'{method}{args}{sorted(kwargs.items(), key=str)}{sql}'.encode()
+        ).hexdigest()
+        return cache.get_or_set(key, compute, ADMIN_DATES_TIMEOUT)
+
+    def aggregate(self, *args, **kwargs):
+        return self._cached('aggregate', *args, **kwargs)
+
+    def datetimes(self, *args, **kwargs):
+        return self._cached('datetimes', *args, **kwargs)
+
+
+class PostChangeList(ChangeList):
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        return CachedDatesQuerySet(
+            model=queryset.model, query=queryset.query, using=queryset.db
+        )
+
 
-from blog.models import Category, Location, Post, Comment
+class PostsCountChangeList(ChangeList):
+    """Список, где публикации считаются только у строк текущей страницы."""
 
+    def get_results(self, request):
+        super().get_results(request)
+        field = self.model_admin.posts_field
+        counts = dict(Post.objects.filter(**{
+            f'{field}__in': [obj.pk for obj in self.result_list]
+        }).order_by().values_list(field).annotate(Count('pk')))
+        for obj in self.result_list:
+            obj.posts_count = counts.get(obj.pk, 0)
 
-class PostInline(admin.StackedInline):
-    model = Post
-    extra = 0
+
+class PostsLinkMixin:
+    """
+    Ссылка на отфильтрованный список публикаций вместо встроенных форм.
+
+    Встроенные формы всех публикаций категории или места не масштабируются,
+    а список публикаций в админке уже умеет фильтровать и листать.
+    """
+
+    posts_field = None
+    readonly_fields = ('posts_link',)
+
+    def get_changelist(self, request, **kwargs):
+        return PostsCountChangeList
+
+    @admin.display(description='Публикации')
+    def posts_link(self, obj):
+        if obj.pk is None:
+            return '—'
+        count = getattr(obj, 'posts_count', None)
+        if count is None:
+            count = obj.posts.count()
+        url = reverse('admin:blog_post_changelist')
+        return format_html(
+            '<a href="{}?{}__id__exact={}">{}</a>',
+            url, self.posts_field, obj.pk, count,
+        )
 
 
 @admin.register(Location)
-class LocationAdmin(admin.ModelAdmin):
-    inlines = (
-        PostInline,
-    )
+class LocationAdmin(PostsLinkMixin, admin.ModelAdmin):
+    posts_field = 'location'
     list_display = (
         'name',
         'is_published',
+        'posts_link',
         'created_at',
     )
     list_editable = ('is_published',)
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
-    inlines = (
-        PostInline,
-    )
+class CategoryAdmin(PostsLinkMixin, admin.ModelAdmin):
+    posts_field = 'category'
     list_display = (
         'title',
         'description',
         'is_published',
+        'posts_link',
         'created_at',
     )
     list_editable = ('is_published',)
@@ -39,7 +119,7 @@ class CategoryAdmin(admin.ModelAdmin):
 class PostAdmin(admin.ModelAdmin):
     list_display = (
         'title',
-        'text',
+        'text_preview',
         'author',
         'category',
         # 'slug',
@@ -49,11 +129,37 @@ class PostAdmin(admin.ModelAdmin):
         'created_at',
     )
     list_editable = ('is_published',)
-    search_fields = ('title', 'author', 'location',)
+    search_fields = ('title', 'text')
     list_filter = ('category', 'location',)
     list_display_links = ('title',)
     list_per_page = 7
     date_hierarchy = 'pub_date'
+    list_select_related = ('author', 'category', 'location')
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    # Число строк в списке оценочное: «Показать все» по нему не решается.
+    list_max_show_all = 0
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer('text').annotate(
+            text_preview=Substr('text', 1, TEXT_PREVIEW_LENGTH)
+        )
+
+    def get_changelist(self, request, **kwargs):
+        return PostChangeList
+
+    @admin.display(description='Текст', ordering='text_preview')
+    def text_preview(self, obj):
+        return obj.text_preview
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term or not fts_available():
+            return super().get_search_results(
+                request, queryset, search_term
+            )
+        if not to_fts_query(search_term):
+            return queryset.none(), False
+        return queryset.filter(pk__in=matching_ids(search_term)), False
 
 
 @admin.register(Comment)
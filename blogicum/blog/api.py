@@ -0,0 +1,148 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Case, F, When
+from django.http import Http404, StreamingHttpResponse
+from django.views.decorators.http import require_safe
+
+from blog.constants import (
+    API_BATCH_SIZE,
+    API_MAX_PER_PAGE,
+    API_POSTS_PER_PAGE,
+    CURSOR_PARAM,
+)
+from blog.models import Category, Comment, Location, Post
+from blog.paginators import KeysetPaginator, iter_batches
+
+POST_FIELDS = (
+    'id', 'title', 'text', 'pub_date', 'updated_at', 'comment_count',
+    'image',
+)
+POST_RELATED = {
+    'author': F('author__username'),
+    'category': F('category__slug'),
+    # Как в шаблонах: снятое с публикации место не показывается.
+    'location': Case(When(
+        location__is_published=True, then=F('location__name')
+    )),
+}
+
+
+def post_rows(posts):
+    """Строки values() публикаций: только поля, без экземпляров модели."""
+    return posts.values(*POST_FIELDS, **{
+        f'{name}_value': expression
+        for name, expression in POST_RELATED.items()
+    })
+
+
+def _post_json(row):
+    for name in POST_RELATED:
+        row[name] = row.pop(f'{name}_value')
+    image = Post._meta.get_field('image')
+    row['image'] = image.storage.url(row['image']) if row['image'] else None
+    return row
+
+
+def _comment_json(row):
+    row['author'] = row.pop('author_value')
+    return row
+
+
+def _dumps(value):
+    return json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def stream_object(fields, array_key, batches, convert=None):
+    """
+    Части JSON-объекта fields с массивом array_key, собранным по пачкам.
+
+    В памяти одновременно лежит только одна пачка строк.
+    """
+    head = _dumps(fields)[:-1]
+    yield f'{head}{", " if fields else ""}"{array_key}": ['
+    separator = ''
+    for batch in batches:
+        if not batch:
+            continue
+        yield separator + ','.join(
+            _dumps(convert(row) if convert else row) for row in batch
+        )
+        separator = ','
+    yield ']}'
+
+
+def json_response(parts):
+    return StreamingHttpResponse(parts, content_type='application/json')
+
+
+def _page_url(request, cursor):
+    if cursor is None:
+        return None
+    query = request.GET.copy()
+    query[CURSOR_PARAM] = cursor
+    return request.build_absolute_uri(f'{request.path}?{query.urlencode()}')
+
+
+def _per_page(request):
+    try:
+        per_page = int(request.GET.get('per_page', API_POSTS_PER_PAGE))
+    except ValueError:
+        per_page = API_POSTS_PER_PAGE
+    return min(max(per_page, 1), API_MAX_PER_PAGE)
+
+
+@require_safe
+def posts(request):
+    """Лента публикаций по курсору; фильтры category и author."""
+    queryset = Post.objects.published()
+    if 'category' in request.GET:
+        queryset = queryset.filter(category__slug=request.GET['category'])
+    if 'author' in request.GET:
+        queryset = queryset.filter(author__username=request.GET['author'])
+    page = KeysetPaginator(
+        post_rows(queryset), _per_page(request)
+    ).get_page(request.GET.get(CURSOR_PARAM))
+    return json_response(stream_object(
+        {
+            'next': _page_url(request, page.next_cursor),
+            'previous': _page_url(request, page.previous_cursor),
+        },
+        'results', [page.object_list], _post_json,
+    ))
+
+
+@require_safe
+def post_detail(request, post_id):
+    """Публикация со всеми комментариями, от старых к новым."""
+    post = post_rows(
+        Post.objects.visible_to(request.user).filter(pk=post_id)
+    ).first()
+    if post is None:
+        raise Http404
+    comments = Comment.objects.filter(post_id=post_id).values(
+        'id', 'text', 'created_at', author_value=F('author__username')
+    )
+    return json_response(stream_object(
+        _post_json(post), 'comments',
+        iter_batches(comments, API_BATCH_SIZE, field='created_at'),
+        _comment_json,
+    ))
+
+
+@require_safe
+def categories(request):
+    return json_response(stream_object({}, 'results', iter_batches(
+        Category.objects.filter(is_published=True).values(
+            'id', 'title', 'slug', 'description'
+        ),
+        API_BATCH_SIZE,
+    )))
+
+
+@require_safe
+def locations(request):
+    return json_response(stream_object({}, 'results', iter_batches(
+        Location.objects.filter(is_published=True).values('id', 'name'),
+        API_BATCH_SIZE,
+    )))
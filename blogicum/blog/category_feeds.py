@@ -0,0 +1,105 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from blog.models import CategoryFeedEntry, Post
+from blog.paginators import iter_batches
+
+REBUILD_BATCH_SIZE = 1000
+FEED_LOOKUPS = ('feed_entry__pub_date', 'feed_entry__post_id')
+
+
+def feed_posts(category):
+    """Опубликованные записи категории, прочитанные из её ленты."""
+    return Post.objects.filter(
+        feed_entry__category=category,
+        feed_entry__pub_date__lte=timezone.now(),
+    )
+
+
+def eligible_posts():
+    """Записи, которые должны быть в лентах категорий."""
+    return Post.objects.filter(
+        is_published=True,
+        category__is_published=True,
+    )
+
+
+def sync_post(post_id):
+    """Привести запись ленты для публикации в соответствие с ней."""
+    state = eligible_posts().filter(pk=post_id).values(
+        'category_id', 'pub_date'
+    ).first()
+    if state is None:
+        CategoryFeedEntry.objects.filter(post_id=post_id).delete()
+        return
+    CategoryFeedEntry.objects.update_or_create(post_id=post_id, defaults=state)
+
+
+def _bulk_insert(posts):
+    rows = posts.order_by('pk').values_list('pk', 'category_id', 'pub_date')
+    batch = []
+    for post_id, category_id, pub_date in rows.iterator(
+        chunk_size=REBUILD_BATCH_SIZE
+    ):
+        batch.append(CategoryFeedEntry(
+            post_id=post_id, category_id=category_id, pub_date=pub_date
+        ))
+        if len(batch) == REBUILD_BATCH_SIZE:
+            CategoryFeedEntry.objects.bulk_create(batch)
+            batch = []
+    CategoryFeedEntry.objects.bulk_create(batch)
+
+
+def sync_posts(post_ids):
+    """Привести записи лент в соответствие с пачкой публикаций."""
+    CategoryFeedEntry.objects.filter(post_id__in=post_ids).delete()
+    _bulk_insert(eligible_posts().filter(pk__in=post_ids))
+
+
+def sync_category(category):
+    """Перестроить ленту одной категории после смены её публикации."""
+    with transaction.atomic():
+        CategoryFeedEntry.objects.filter(category=category).delete()
+        _bulk_insert(eligible_posts().filter(category=category))
+
+
+def rebuild(categories=None):
+    """Перестроить ленты указанных категорий или всех сразу."""
+    entries = CategoryFeedEntry.objects.all()
+    posts = eligible_posts()
+    if categories is not None:
+        entries = entries.filter(category__in=categories)
+        posts = posts.filter(category__in=categories)
+    with transaction.atomic():
+        entries.delete()
+        _bulk_insert(posts)
+
+
+def missing_posts():
+    """Публикации, которых нет в ленте или чья запись устарела."""
+    return eligible_posts().exclude(
+        feed_entry__category=F('category'),
+        feed_entry__pub_date=F('pub_date'),
+    )
+
+
+def extra_entries():
+    """Записи лент, которые не соответствуют своей публикации."""
+    return CategoryFeedEntry.objects.exclude(
+        post__is_published=True,
+        post__category__is_published=True,
+        post__category=F('category'),
+        post__pub_date=F('pub_date'),
+    )
+
+
+def fix_inconsistencies(batch_size=REBUILD_BATCH_SIZE):
+    """Исправить расхождения пачками, не собирая все id в память."""
+    for rows, key in (
+        (missing_posts().values('id'), 'id'),
+        (extra_entries().values('post_id'), 'post_id'),
+    ):
+        for batch in iter_batches(rows, batch_size):
+            with transaction.atomic():
+                sync_posts([row[key] for row in batch])
@@ -0,0 +1,131 @@
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.db.models import Max, OuterRef, Subquery
+from django.utils import timezone
+
+from blog.models import Category, Comment, Location, Post
+from blog.page_cache import (
+    GLOBAL_SCOPE, INDEX_SCOPE, category_scope, get_generation, post_scope
+)
+
+User = get_user_model()
+
+
+def page_etag(request, scopes, *parts):
+    """
+    Значение ETag страницы из поколений её областей кэша и прочих частей.
+
+    Поколения лежат в общем кэше и сдвигаются сигналами, в том числе при
+    удалениях. Части — состояние базы: время последних правок строк на
+    странице, поэтому изменения в обход сигналов (update(), другие
+    процессы, вытесненный кэш) тоже меняют ETag. В него входят адрес и
+    пользователь: страницы разных пользователей отличаются шапкой и
+    видимыми им публикациями.
+    """
+    user = request.user
+    parts = (
+        request.get_full_path(),
+        user.pk,
+        user.get_username() if user.is_authenticated else '',
+        *(get_generation(scope) for scope in (GLOBAL_SCOPE, *scopes)),
+        *parts,
+    )
+    return hashlib.md5('|'.join(map(str, parts)).encode()).hexdigest()
+
+
+def latest_changes(*querysets):
+    """Время последней правки строк каждого из querysets."""
+    return tuple(
+        queryset.aggregate(value=Max('updated_at'))['value']
+        for queryset in querysets
+    )
+
+
+def index_etag(request):
+    return page_etag(
+        request,
+        (INDEX_SCOPE,),
+        Post.objects.next_publication(),
+        *latest_changes(
+            Post.objects.all(), Category.objects.all(), Location.objects.all()
+        ),
+    )
+
+
+def category_etag(request, category_slug):
+    posts = Post.objects.filter(category__slug=category_slug)
+    return page_etag(
+        request,
+        (category_scope(category_slug),),
+        posts.next_publication(),
+        *latest_changes(
+            posts, Category.objects.all(), Location.objects.all()
+        ),
+    )
+
+
+def post_detail_etag(request, post_id):
+    # Одним запросом: видимость (отложенная публикация станет видна всем,
+    # не меняя поколений), правки публикации, автора, категории, места и
+    # комментариев.
+    comments = Comment.objects.filter(post=OuterRef('pk')).order_by(
+        '-updated_at'
+    ).values('updated_at')[:1]
+    state = Post.objects.visible_to(request.user).filter(
+        pk=post_id
+    ).annotate(comments_updated_at=Subquery(comments)).values_list(
+        'updated_at', 'comments_updated_at', 'category__updated_at',
+        'location__updated_at', 'author__username', 'author__first_name',
+        'author__last_name',
+    ).first()
+    return page_etag(request, (post_scope(post_id),), state)
+
+
+def profile_etag(request, username):
+    # Любое изменение публикации или комментария сдвигает поколение ленты
+    # на главной, поэтому профиль валидируется по нему.
+    posts = Post.objects.filter(author__username=username)
+    return page_etag(
+        request,
+        (INDEX_SCOPE,),
+        User.objects.filter(username=username).values_list(
+            'pk', 'username', 'first_name', 'last_name', 'email'
+        ).first(),
+        posts.next_publication(),
+        *latest_changes(
+            posts, Category.objects.all(), Location.objects.all()
+        ),
+    )
+
+
+def feed_last_modified(posts):
+    """
+    Время последнего изменения ленты из публикаций posts.
+
+    Учитываются правки публикаций и категорий и наступившие отложенные
+    публикации. Удаление публикации время не сдвигает: его замечает
+    только ETag.
+    """
+    latest = (
+        posts.aggregate(value=Max('updated_at'))['value'],
+        posts.filter(pub_date__lte=timezone.now()).aggregate(
+            value=Max('pub_date')
+        )['value'],
+        Category.objects.aggregate(value=Max('updated_at'))['value'],
+    )
+    return max(filter(None, latest), default=None)
+
+
+def index_last_modified(request):
+    return feed_last_modified(Post.objects.all())
+
+
+def category_last_modified(request, category_slug):
+    return feed_last_modified(
+        Post.objects.filter(category__slug=category_slug)
+    )
+
+
+def author_last_modified(request, username):
+    return feed_last_modified(Post.objects.filter(author__username=username))
@@ -1,3 +1,47 @@
 TITLE_LENGTH = 256
 TITLE_STR_LENGTH = 50
 NUMBER_POSTS_PER_PAGE = 10
+NUMBER_COMMENTS_PER_PAGE = 20
+# Лента листается курсором (pub_date, id) вместо номера страницы.
+PAGINATE_FEEDS_BY_CURSOR = False
+CURSOR_PARAM = 'cursor'
+DATE_PARAM = 'date'
+PAGINATOR_ON_EACH_SIDE = 2
+PAGINATOR_ON_ENDS = 1
+# Через сколько секунд кэшированное число публикаций в ленте пересчитывается.
+FEED_COUNT_TIMEOUT = 60 * 15
+# Сколько секунд хранится страница, отрисованная для анонимного посетителя.
+# Раньше срока страница устаревает, когда наступает время отложенной записи.
+PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+TEXT_PREVIEW_LENGTH = 50
+# Сколько секунд админка хранит разбивку публикаций по датам.
+ADMIN_DATES_TIMEOUT = 60 * 10
+# Ширины уменьшенных копий изображений публикаций и качество JPEG.
+RENDITION_WIDTHS = (320, 640, 1280)
+RENDITION_QUALITY = 80
+# Ширина изображения на странице, подсказка браузеру для выбора копии.
+RENDITION_SIZES = '(max-width: 40rem) 100vw, 40rem'
+# Через сколько секунд задание, взятое обработчиком, считается брошенным,
+# и сколько неудачных попыток делается до того, как задание откладывается.
+IMAGE_JOB_CLAIM_TIMEOUT = 60 * 10
+IMAGE_JOB_MAX_ATTEMPTS = 3
+# Сколько секунд браузер хранит медиафайл, не переспрашивая сервер;
+# файлы с именем по хэшу содержимого не меняются и хранятся год.
+MEDIA_CACHE_TIMEOUT = 60 * 60
+MEDIA_IMMUTABLE_TIMEOUT = 60 * 60 * 24 * 365
+# Сколько последних публикаций входит в RSS- и Atom-ленты.
+FEED_ITEMS = 20
+# Ширина куска карты сайта по первичному ключу (не больше 50 000 адресов),
+# размер пачки при его генерации и сколько секунд живут файлы на диске.
+SITEMAP_CHUNK_SIZE = 10000
+SITEMAP_BATCH_SIZE = 1000
+SITEMAP_CACHE_TIMEOUT = 60 * 60 * 24
+SITEMAP_INDEX_TIMEOUT = 60 * 60
+# Публикаций на странице JSON API по умолчанию и не больше чем, а также
+# размер пачки строк при потоковой выдаче списков.
+API_POSTS_PER_PAGE = 20
+API_MAX_PER_PAGE = 100
+API_BATCH_SIZE = 500
+# Строк в пачке при выгрузке и загрузке данных блога; каждая пачка
+# загружается своей транзакцией.
+TRANSFER_BATCH_SIZE = 1000
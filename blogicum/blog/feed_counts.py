@@ -0,0 +1,111 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from blog.constants import FEED_COUNT_TIMEOUT
+from blog.models import Category, Post
+from blog.page_cache import timeout_before
+from blog.paginators import iter_batches
+
+User = get_user_model()
+AUTHOR_FEED_SCOPES = ('public', 'all')
+FORGET_BATCH_SIZE = 1000
+
+
+def feed_count_key(feed, *parts):
+    return ':'.join(('feed_count', feed, *map(str, parts)))
+
+
+def post_feed_state(post_id):
+    return Post.objects.filter(pk=post_id).values(
+        'author_id',
+        'category_id',
+        'category__is_published',
+        'is_published',
+        'pub_date',
+    ).first()
+
+
+def category_feed_count_keys(category):
+    author_ids = Post.objects.filter(
+        category=category
+    ).order_by().values_list('author_id', flat=True).distinct()
+    return {
+        feed_count_key('index'),
+        feed_count_key('category', category.pk),
+        *(feed_count_key('author', pk, 'public') for pk in author_ids),
+    }
+
+
+def post_feed_count_keys(state):
+    """Ключи счётчиков лент, в которых учитывается публикация."""
+    if state is None:
+        return set()
+    keys = {feed_count_key('author', state['author_id'], 'all')}
+    if (
+        state['is_published']
+        and state['category__is_published']
+        and state['pub_date'] <= timezone.now()
+    ):
+        keys |= {
+            feed_count_key('index'),
+            feed_count_key('category', state['category_id']),
+            feed_count_key('author', state['author_id'], 'public'),
+        }
+    return keys
+
+
+def shift_feed_counts(old_keys, new_keys):
+    """Поправить закэшированные счётчики; отсутствующие не создаются."""
+    for keys, delta in ((new_keys - old_keys, 1), (old_keys - new_keys, -1)):
+        for key in keys:
+            try:
+                cache.incr(key, delta)
+            except ValueError:
+                pass
+
+
+def forget_feed_counts(*keys):
+    cache.delete_many(keys)
+
+
+def forget_all_feed_counts():
+    """Забыть все счётчики лент, например после массовой загрузки строк."""
+    forget_feed_counts(feed_count_key('index'))
+    categories = Category.objects.values('id')
+    for batch in iter_batches(categories, FORGET_BATCH_SIZE):
+        forget_feed_counts(*(
+            feed_count_key('category', row['id']) for row in batch
+        ))
+    for batch in iter_batches(User.objects.values('id'), FORGET_BATCH_SIZE):
+        forget_feed_counts(*(
+            feed_count_key('author', row['id'], scope)
+            for row in batch for scope in AUTHOR_FEED_SCOPES
+        ))
+
+
+class CachedCountPaginator(Paginator):
+    """Пагинатор, который берёт число записей из кэша, а не из COUNT(*)."""
+
+    def __init__(self, object_list, per_page, count_key=None,
+                 scheduled=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+        self.scheduled = scheduled
+
+    @cached_property
+    def count(self):
+        if self.count_key is None:
+            return self.object_list.count()
+        count = cache.get(self.count_key)
+        if count is None:
+            count = self.object_list.count()
+            timeout = FEED_COUNT_TIMEOUT
+            if self.scheduled is not None:
+                timeout = timeout_before(
+                    self.scheduled.next_publication(), timeout
+                )
+            cache.add(self.count_key, count, timeout)
+        return max(count, 0)
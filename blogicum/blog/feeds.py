@@ -0,0 +1,165 @@
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.views.decorators.http import condition
+
+from blog.conditional import (
+    author_last_modified,
+    category_etag,
+    category_last_modified,
+    index_etag,
+    index_last_modified,
+    profile_etag,
+)
+from blog.constants import FEED_ITEMS
+from blog.models import Category, Post
+from blog.page_cache import (
+    INDEX_SCOPE, cache_page_for_anonymous, category_scope
+)
+from blog.views import get_category_scheduled, get_filtered_posts
+
+User = get_user_model()
+
+
+class LatestPostsFeed(Feed):
+    """RSS последних публикаций сайта."""
+
+    title = 'Блогикум: новые публикации'
+    description = 'Последние публикации всех авторов.'
+
+    def __call__(self, request, *args, **kwargs):
+        response = super().__call__(request, *args, **kwargs)
+        # Last-Modified ставит condition(): Feed берёт его из дат записей и
+        # не замечает переименований и снятых с публикации записей.
+        del response['Last-Modified']
+        return response
+
+    def link(self):
+        return reverse('blog:index')
+
+    def items(self):
+        return get_filtered_posts().order_by('-pub_date', '-id')[:FEED_ITEMS]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.text
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.author.get_username()
+
+    def item_categories(self, item):
+        return (item.category.title,)
+
+
+class CategoryPostsFeed(LatestPostsFeed):
+    """RSS публикаций категории."""
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True
+        )
+
+    def title(self, obj):
+        return f'Блогикум: {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse('blog:category_posts', args=(obj.slug,))
+
+    def items(self, obj):
+        return get_filtered_posts().filter(category=obj).order_by(
+            '-pub_date', '-id'
+        )[:FEED_ITEMS]
+
+
+class AuthorPostsFeed(LatestPostsFeed):
+    """RSS опубликованных записей автора."""
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, obj):
+        return f'Блогикум: публикации @{obj.get_username()}'
+
+    def description(self, obj):
+        return f'Последние публикации @{obj.get_username()}.'
+
+    def link(self, obj):
+        return reverse('blog:profile', args=(obj.get_username(),))
+
+    def items(self, obj):
+        return get_filtered_posts().filter(author=obj).order_by(
+            '-pub_date', '-id'
+        )[:FEED_ITEMS]
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class CategoryPostsAtomFeed(CategoryPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class AuthorPostsAtomFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+def get_author_scheduled(username):
+    return Post.objects.filter(author__username=username)
+
+
+def feed_view(feed, scope, scheduled, etag_func, last_modified_func):
+    """Ленту отдаёт кэш страниц, а неизменившуюся — ответ 304."""
+    return cache_page_for_anonymous(scope, scheduled=scheduled)(condition(
+        etag_func=etag_func, last_modified_func=last_modified_func
+    )(feed))
+
+
+def site_feed(feed):
+    return feed_view(
+        feed, INDEX_SCOPE, Post.objects.all,
+        index_etag, index_last_modified,
+    )
+
+
+def category_feed(feed):
+    return feed_view(
+        feed, category_scope, get_category_scheduled,
+        category_etag, category_last_modified,
+    )
+
+
+def author_feed(feed):
+    # Публикации автора сдвигают поколение главной ленты.
+    return feed_view(
+        feed, INDEX_SCOPE, get_author_scheduled,
+        profile_etag, author_last_modified,
+    )
+
+
+latest_posts_rss = site_feed(LatestPostsFeed())
+latest_posts_atom = site_feed(LatestPostsAtomFeed())
+category_posts_rss = category_feed(CategoryPostsFeed())
+category_posts_atom = category_feed(CategoryPostsAtomFeed())
+author_posts_rss = author_feed(AuthorPostsFeed())
+author_posts_atom = author_feed(AuthorPostsAtomFeed())
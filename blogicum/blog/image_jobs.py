@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Min, Q
+from django.utils import timezone
+
+from blog.constants import IMAGE_JOB_CLAIM_TIMEOUT, IMAGE_JOB_MAX_ATTEMPTS
+from blog.models import ImageJob
+
+
+def enqueue(name):
+    """Поставить изображение в очередь; повторная постановка — заново."""
+    ImageJob.objects.update_or_create(name=name, defaults={
+        'created_at': timezone.now(),
+        'claimed_at': None,
+        'attempts': 0,
+        'error': '',
+    })
+
+
+def discard(name):
+    ImageJob.objects.filter(name=name).delete()
+
+
+def pending():
+    """Задания, которые ещё будут обработаны."""
+    return ImageJob.objects.filter(attempts__lt=IMAGE_JOB_MAX_ATTEMPTS)
+
+
+def _claimable(now):
+    return pending().filter(
+        Q(claimed_at__isnull=True)
+        | Q(claimed_at__lt=now - timedelta(seconds=IMAGE_JOB_CLAIM_TIMEOUT))
+    )
+
+
+def claim(limit):
+    """
+    Взять в работу до limit самых старых заданий.
+
+    Задание помечается временем взятия; если обработчик не отчитался за
+    IMAGE_JOB_CLAIM_TIMEOUT, его задания может взять другой обработчик.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            _claimable(now).order_by('created_at', 'pk')
+            .values_list('pk', flat=True)[:limit]
+        )
+        _claimable(now).filter(pk__in=ids).update(claimed_at=now)
+    return list(
+        ImageJob.objects.filter(pk__in=ids, claimed_at=now)
+        .order_by('created_at', 'pk')
+    )
+
+
+def finish(job, error=None):
+    """
+    Отчитаться о задании: удалить его или записать ошибку.
+
+    Задание, поставленное заново во время обработки, не трогается.
+    """
+    jobs = ImageJob.objects.filter(pk=job.pk, claimed_at=job.claimed_at)
+    if error is None:
+        jobs.delete()
+    else:
+        jobs.update(
+            claimed_at=None, attempts=F('attempts') + 1, error=error
+        )
+
+
+def get_stats():
+    """Глубина очереди, число отложенных заданий и возраст старейшего."""
+    oldest = pending().aggregate(oldest=Min('created_at'))['oldest']
+    return {
+        'depth': pending().count(),
+        'failed': ImageJob.objects.filter(
+            attempts__gte=IMAGE_JOB_MAX_ATTEMPTS
+        ).count(),
+        'oldest_age': (
+            (timezone.now() - oldest).total_seconds() if oldest else 0
+        ),
+    }
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog import category_feeds
+
+
+class Command(BaseCommand):
+    help = 'Сверяет материализованные ленты категорий с публикациями.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Исправить найденные расхождения.',
+        )
+
+    def handle(self, *args, fix, **options):
+        missing = category_feeds.missing_posts().count()
+        extra = category_feeds.extra_entries().count()
+        if not missing and not extra:
+            self.stdout.write(self.style.SUCCESS('Ленты категорий в порядке.'))
+            return
+        message = f'Нет в ленте: {missing}, лишних или устаревших: {extra}.'
+        if not fix:
+            raise CommandError(message)
+        category_feeds.fix_inconsistencies()
+        self.stdout.write(self.style.WARNING(f'Исправлено. {message}'))
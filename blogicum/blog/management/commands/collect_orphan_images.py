@@ -0,0 +1,74 @@
+import posixpath
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.models import ImageJob, Post
+from blog.renditions import original_name
+
+
+def walk(storage, path):
+    directories, files = storage.listdir(path)
+    for name in files:
+        yield posixpath.join(path, name)
+    for directory in directories:
+        yield from walk(storage, posixpath.join(path, directory))
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет изображения публикаций и их копии, на которые не '
+        'ссылается ни одна публикация.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace',
+            type=int,
+            default=60 * 60,
+            help=(
+                'Не трогать файлы моложе стольких секунд: они могли быть '
+                'загружены для ещё не сохранённой публикации.'
+            ),
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать, что было бы удалено.',
+        )
+
+    def handle(self, *args, grace, dry_run, **options):
+        field = Post._meta.get_field('image')
+        storage, root = field.storage, field.upload_to
+        images = Post.objects.exclude(image='').exclude(image__isnull=True)
+        referenced = set(images.values_list('image', flat=True).distinct())
+        if not storage.exists(root):
+            return
+        cutoff = timezone.now() - timedelta(seconds=grace)
+        removed = freed = 0
+        for name in walk(storage, root):
+            original = original_name(name) or name
+            if original in referenced:
+                continue
+            # Копии живут, пока свеж их оригинал: его могли загрузить заново.
+            if max(
+                storage.get_modified_time(path)
+                for path in {name, original} if storage.exists(path)
+            ) > cutoff:
+                continue
+            removed += 1
+            freed += storage.size(name)
+            if dry_run:
+                self.stdout.write(name)
+            else:
+                storage.delete(name)
+        if not dry_run:
+            ImageJob.objects.exclude(
+                name__in=images.values('image')
+            ).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f'Используется изображений: {len(referenced)}\n'
+            f'{"Будет удалено" if dry_run else "Удалено"} файлов: {removed}, '
+            f'{freed / 1024 / 1024:.1f} МБ'
+        ))
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from blog import transfer
+from blog.constants import TRANSFER_BATCH_SIZE
+
+
+def parse_moment(value):
+    moment = parse_datetime(value)
+    if moment is None:
+        raise CommandError(f'Неверная дата и время: {value}')
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает пользователей, категории, местоположения, публикации '
+        'и комментарии в сжатые файлы JSONL.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help='Каталог для файлов выгрузки.')
+        parser.add_argument(
+            '--since',
+            help=(
+                'Выгрузить только строки, изменённые после этого момента '
+                '(ISO 8601); удаления так не переносятся.'
+            ),
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=TRANSFER_BATCH_SIZE,
+            help='Строк в одной пачке.',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Продолжить прерванную выгрузку с контрольной точки.',
+        )
+
+    def handle(self, *args, directory, since, batch_size, resume,
+               **options):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        checkpoint = directory / transfer.EXPORT_CHECKPOINT
+        state = transfer.read_checkpoint(checkpoint) if resume else None
+        if state is None:
+            if resume:
+                raise CommandError('Контрольная точка не найдена.')
+            for model in transfer.MODELS:
+                transfer.data_path(directory, model).unlink(missing_ok=True)
+            if since:
+                parse_moment(since)
+            state = {
+                'since': since,
+                'started': timezone.now().isoformat(),
+                'models': {},
+            }
+            transfer.write_checkpoint(checkpoint, state)
+        # При продолжении действует --since из контрольной точки.
+        since = state['since'] and parse_moment(state['since'])
+
+        def save():
+            transfer.write_checkpoint(checkpoint, state)
+
+        for model in transfer.MODELS:
+            label = model._meta.label_lower
+            model_state = state['models'].setdefault(label, {})
+            if not model_state.get('done'):
+                transfer.export_model(
+                    directory, model, model_state, batch_size, since, save
+                )
+            self.stdout.write(f'{label}: {model_state.get("rows", 0)}')
+        self.stdout.write(self.style.SUCCESS(
+            'Выгрузка завершена. Следующую выгружайте с '
+            f'--since {state["started"]}'
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from blog.image_jobs import get_stats
+
+
+class Command(BaseCommand):
+    help = 'Показывает состояние очереди обработки изображений.'
+
+    def handle(self, *args, **options):
+        stats = get_stats()
+        self.stdout.write(
+            f"В очереди: {stats['depth']}\n"
+            f"Отложено после ошибок: {stats['failed']}\n"
+            f"Ожидает дольше всех: {stats['oldest_age']:.1f} с"
+        )
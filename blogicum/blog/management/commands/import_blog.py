@@ -0,0 +1,50 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog import transfer
+from blog.constants import TRANSFER_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает данные блога из файлов export_blog: новые строки '
+        'добавляются, существующие обновляются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help='Каталог с файлами выгрузки.')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=TRANSFER_BATCH_SIZE,
+            help='Строк в одной пачке и транзакции.',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Продолжить прерванную загрузку с контрольной точки.',
+        )
+
+    def handle(self, *args, directory, batch_size, resume, **options):
+        directory = Path(directory)
+        if not directory.is_dir():
+            raise CommandError(f'Каталог {directory} не найден.')
+        checkpoint = directory / transfer.IMPORT_CHECKPOINT
+        state = {}
+        if resume:
+            state = transfer.read_checkpoint(checkpoint) or {}
+
+        def save():
+            transfer.write_checkpoint(checkpoint, state)
+
+        for model in transfer.MODELS:
+            label = model._meta.label_lower
+            loaded = transfer.import_model(
+                directory, model, state.setdefault(label, {}),
+                batch_size, save,
+            )
+            self.stdout.write(f'{label}: {loaded}')
+        transfer.finish_import()
+        checkpoint.unlink(missing_ok=True)
+        self.stdout.write(self.style.SUCCESS('Загрузка завершена.'))
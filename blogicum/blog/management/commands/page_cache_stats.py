@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.page_cache import cache_is_shared, get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = 'Показывает попадания и промахи кэша страниц для анонимов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Обнулить счётчики после вывода.',
+        )
+
+    def handle(self, *args, reset, **options):
+        if not cache_is_shared():
+            raise CommandError(
+                'Кэш хранится в памяти процесса: счётчики веб-сервера '
+                'отсюда не видны. Настройте общий бэкенд в CACHES.'
+            )
+        stats = get_stats()
+        total = stats['hits'] + stats['misses']
+        hit_rate = stats['hits'] / total * 100 if total else 0
+        self.stdout.write(
+            f"Попадания: {stats['hits']}\n"
+            f"Промахи: {stats['misses']}\n"
+            f'Доля попаданий: {hit_rate:.1f}%'
+        )
+        if reset:
+            reset_stats()
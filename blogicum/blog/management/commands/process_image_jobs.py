@@ -0,0 +1,106 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+from blog import image_jobs, renditions
+from blog.models import Post
+from blog.page_cache import cache_is_shared, invalidate_pages, post_scope
+from blog.signals import invalidate_post_pages
+
+
+class Command(BaseCommand):
+    help = (
+        'Обрабатывает очередь изображений публикаций: создаёт их '
+        'уменьшенные копии в пуле процессов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=None,
+            help='Число процессов; по умолчанию — по числу ядер.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=32,
+            help='Сколько заданий брать из очереди за раз.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза в секундах, когда очередь пуста.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Обработать очередь и завершиться.',
+        )
+
+    def handle(self, *args, processes, batch_size, interval, once,
+               **options):
+        if not cache_is_shared():
+            raise CommandError(
+                'Кэш хранится в памяти процесса: веб-сервер не узнает об '
+                'обработанных изображениях. Настройте общий бэкенд в CACHES.'
+            )
+        if processes == 1:
+            self.work(map, batch_size, interval, once)
+            return
+        # Дочерним процессам не нужна БД: не наследуем соединения.
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            self.work(executor.map, batch_size, interval, once)
+
+    def work(self, run, batch_size, interval, once):
+        while True:
+            jobs = image_jobs.claim(batch_size)
+            if not jobs:
+                if once:
+                    return
+                time.sleep(interval)
+                continue
+            errors = list(
+                run(renditions.try_make_renditions, [j.name for j in jobs])
+            )
+            for job, error in zip(jobs, errors):
+                image_jobs.finish(job, error)
+                if error:
+                    self.stderr.write(error)
+            self.touch_posts(
+                job.name for job, error in zip(jobs, errors) if not error
+            )
+            self.report(jobs, errors)
+
+    def touch_posts(self, names):
+        """
+        Отметить публикации с обработанными изображениями изменёнными.
+
+        Закэшированные страницы и выданные ETag всё ещё ссылаются только на
+        оригиналы: сдвигаются поколения кэша и время изменения публикаций.
+        """
+        posts = Post.objects.filter(image__in=list(names))
+        post_ids = list(posts.values_list('pk', flat=True))
+        if not post_ids:
+            return
+        invalidate_pages(*map(post_scope, post_ids))
+        invalidate_post_pages(
+            *posts.values_list('category_id', flat=True).distinct()
+        )
+        posts.update(updated_at=timezone.now())
+
+    def report(self, jobs, errors):
+        now = timezone.now()
+        latencies = [(now - job.created_at).total_seconds() for job in jobs]
+        failed = sum(1 for error in errors if error)
+        self.stdout.write(
+            f'Обработано: {len(jobs) - failed}, ошибок: {failed}, '
+            f'задержка: средняя {sum(latencies) / len(latencies):.1f} с, '
+            f'наибольшая {max(latencies):.1f} с, '
+            f"в очереди: {image_jobs.get_stats()['depth']}"
+        )
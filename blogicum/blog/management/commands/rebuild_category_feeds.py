@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog import category_feeds
+from blog.models import Category, CategoryFeedEntry
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает материализованные ленты категорий.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'slugs',
+            nargs='*',
+            help='Идентификаторы категорий; по умолчанию — все категории.',
+        )
+
+    def handle(self, *args, slugs, **options):
+        categories = None
+        if slugs:
+            categories = Category.objects.filter(slug__in=slugs)
+            unknown = set(slugs) - set(
+                categories.values_list('slug', flat=True)
+            )
+            if unknown:
+                raise CommandError(
+                    f'Категории не найдены: {", ".join(sorted(unknown))}'
+                )
+        category_feeds.rebuild(categories)
+        self.stdout.write(self.style.SUCCESS(
+            f'Записей в лентах: {CategoryFeedEntry.objects.count()}'
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.models import Post
+from blog.search import fts_available, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Заново строит полнотекстовый индекс публикаций.'
+
+    def handle(self, *args, **options):
+        if not fts_available():
+            raise CommandError('Полнотекстовый индекс есть только в SQLite.')
+        rebuild_index(Post.objects.all())
+        self.stdout.write(self.style.SUCCESS('Индекс перестроен.'))
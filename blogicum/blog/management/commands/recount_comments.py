@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённое количество комментариев у публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Сколько публикаций обновлять за один запрос.',
+        )
+
+    def handle(self, *args, batch_size, **options):
+        updated = 0
+        last_id = 0
+        while True:
+            ids = list(
+                Post.objects.filter(id__gt=last_id).order_by('id')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            updated += Post.objects.filter(
+                id__gte=ids[0], id__lte=ids[-1]
+            ).recount_comments()
+            last_id = ids[-1]
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено публикаций: {updated}')
+        )
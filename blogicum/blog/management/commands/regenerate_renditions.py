@@ -0,0 +1,53 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from blog import renditions
+from blog.models import Post
+
+CHUNK_SIZE = 16
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии изображений публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=None,
+            help='Число процессов; по умолчанию — по числу ядер.',
+        )
+        parser.add_argument(
+            '--missing',
+            action='store_true',
+            help='Обработать только изображения без копий.',
+        )
+
+    def handle(self, *args, processes, missing, **options):
+        names = Post.objects.exclude(image='').exclude(
+            image__isnull=True
+        ).order_by('image').values_list('image', flat=True).distinct()
+        names = list(names)
+        if missing:
+            names = [
+                name for name in names
+                if not renditions.has_renditions(name)
+            ]
+        if processes == 1:
+            errors = list(map(renditions.try_make_renditions, names))
+        else:
+            # Дочерним процессам не нужна БД: не наследуем соединения.
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                errors = list(executor.map(
+                    renditions.try_make_renditions, names,
+                    chunksize=CHUNK_SIZE,
+                ))
+        errors = [error for error in errors if error]
+        for error in errors:
+            self.stderr.write(error)
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано изображений: {len(names) - len(errors)}'
+        ))
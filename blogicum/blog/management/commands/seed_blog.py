@@ -0,0 +1,101 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from blog import seeding
+from blog.models import Post
+from blog.transfer import forget_cached_pages, reset_sequences
+
+DEFAULT_COUNTS = {
+    'categories': 20,
+    'locations': 100,
+    'users': 1000,
+    'posts': 10000,
+    'comments': 50000,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Наполняет базу синтетическими пользователями, публикациями и '
+        'комментариями для проверки производительности.'
+    )
+
+    def add_arguments(self, parser):
+        for kind, default in DEFAULT_COUNTS.items():
+            parser.add_argument(
+                f'--{kind}',
+                type=int,
+                default=default,
+                help=f'Сколько создать строк ({kind}).',
+            )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Зерно: с тем же зерном на пустой базе данные совпадают.',
+        )
+        parser.add_argument(
+            '--unpublished-share',
+            type=float,
+            default=0.05,
+            help='Доля снятых с публикации строк.',
+        )
+        parser.add_argument(
+            '--scheduled-share',
+            type=float,
+            default=0.02,
+            help='Доля отложенных публикаций.',
+        )
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=None,
+            help=(
+                'Число процессов, строящих строки; по умолчанию — по '
+                'числу ядер. Пишет в базу только основной процесс.'
+            ),
+        )
+
+    def handle(self, *args, seed, unpublished_share, scheduled_share,
+               processes, **options):
+        counts = {kind: options[kind] for kind in DEFAULT_COUNTS}
+        if any(count < 0 for count in counts.values()):
+            raise CommandError('Число строк не может быть отрицательным.')
+        if counts['posts'] and not (counts['users'] and counts['categories']):
+            raise CommandError('Для публикаций нужны авторы и категории.')
+        plan = seeding.make_plan(
+            counts, seed, timezone.now(), unpublished_share,
+            scheduled_share, make_password(None),
+        )
+        if counts['comments'] and not (
+            counts['users'] and counts['posts'] > plan['scheduled']
+        ):
+            raise CommandError(
+                'Для комментариев нужны авторы и наступившие публикации.'
+            )
+
+        if processes == 1:
+            self._seed(plan, map)
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                self._seed(plan, executor.map)
+
+        Post.objects.filter(
+            pk__gt=plan['bases']['posts']
+        ).recount_comments()
+        reset_sequences(seeding.MODELS.values())
+        forget_cached_pages()
+        self.stdout.write(self.style.SUCCESS('База наполнена.'))
+
+    def _seed(self, plan, run):
+        for kind in seeding.KINDS:
+            created = sum(
+                seeding.save_chunk(kind, objects)
+                for objects in run(
+                    seeding.build_chunk, seeding.tasks(plan, kind)
+                )
+            )
+            self.stdout.write(f'{kind}: {created}')
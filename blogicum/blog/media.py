@@ -0,0 +1,141 @@
+import mimetypes
+import os
+import posixpath
+import re
+import stat
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (
+    FileResponse, Http404, HttpResponse, StreamingHttpResponse
+)
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+from blog.constants import MEDIA_CACHE_TIMEOUT, MEDIA_IMMUTABLE_TIMEOUT
+from blog.storage import is_content_addressed
+
+MEDIA_DIRS = ('post_images',)
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_range(header, size):
+    """
+    Границы (start, end) единственного диапазона из заголовка Range.
+
+    None — заголовка нет или он не поддерживается, тогда отдаётся весь
+    файл; ValueError — диапазон не пересекается с файлом.
+    """
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if not match or match.groups() == ('', ''):
+        return None
+    start, end = match.groups()
+    if not start:
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+    if start > end or start >= size:
+        raise ValueError(header)
+    return start, end
+
+
+def _read(file, length):
+    with file:
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+def _range_requested(request, etag, mtime):
+    if 'HTTP_RANGE' not in request.META:
+        return False
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range is None or if_range == etag:
+        return True
+    return parse_http_date_safe(if_range) == int(mtime)
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Отдать медиафайл публикаций.
+
+    Поддерживаются условные запросы (ETag, Last-Modified) и один диапазон
+    Range. Файлы с именем по хэшу содержимого кэшируются как неизменяемые;
+    их копии — нет: regenerate_renditions переписывает копии под теми же
+    именами. Если задан MEDIA_ACCEL_REDIRECT_PREFIX, сам файл отдаёт
+    прокси по заголовку X-Accel-Redirect.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    if path.split('/', 1)[0] not in MEDIA_DIRS:
+        raise Http404
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        info = os.stat(full_path)
+    except (OSError, SuspiciousFileOperation):
+        raise Http404
+    if not stat.S_ISREG(info.st_mode):
+        raise Http404
+
+    etag = f'"{info.st_mtime_ns:x}-{info.st_size:x}"'
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(info.st_mtime)
+    )
+    if response is None:
+        response = _file_response(request, path, full_path, info, etag)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(info.st_mtime)
+    if is_content_addressed(path):
+        response['Cache-Control'] = (
+            f'public, max-age={MEDIA_IMMUTABLE_TIMEOUT}, immutable'
+        )
+    else:
+        response['Cache-Control'] = f'public, max-age={MEDIA_CACHE_TIMEOUT}'
+    return response
+
+
+def _file_response(request, path, full_path, info, etag):
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    prefix = settings.MEDIA_ACCEL_REDIRECT_PREFIX
+    if prefix:
+        # Диапазоны и саму передачу берёт на себя прокси.
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = posixpath.join(prefix, path)
+        return response
+
+    size = info.st_size
+    try:
+        byte_range = (
+            parse_range(request.META['HTTP_RANGE'], size)
+            if _range_requested(request, etag, info.st_mtime) else None
+        )
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    file = open(full_path, 'rb')
+    if byte_range is None:
+        response = FileResponse(file, content_type=content_type)
+    else:
+        start, end = byte_range
+        file.seek(start)
+        if end == size - 1:
+            # До конца файла: FileResponse отдаст его через sendfile.
+            response = FileResponse(file, content_type=content_type)
+        else:
+            response = StreamingHttpResponse(
+                _read(file, end - start + 1), content_type=content_type
+            )
+        response.status_code = 206
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = end - start + 1
+    response['Accept-Ranges'] = 'bytes'
+    return response
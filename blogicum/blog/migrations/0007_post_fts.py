@@ -0,0 +1,32 @@
+from django.db import migrations
+
+FTS_TABLE = 'blog_post_fts'
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+        "title, text, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute(
+        f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+        'SELECT id, title, text FROM blog_post'
+    )
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_category_feed_entry'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:39
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_pub_date_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Изображение')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Поставлено в очередь')),
+                ('claimed_at', models.DateTimeField(blank=True, null=True, verbose_name='Взято в работу')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Неудачных попыток')),
+                ('error', models.TextField(blank=True, verbose_name='Последняя ошибка')),
+            ],
+            options={
+                'verbose_name': 'задание обработки изображения',
+                'verbose_name_plural': 'Очередь обработки изображений',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='imagejob',
+            index=models.Index(fields=['attempts', 'created_at'], name='image_job_queue_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:46
+
+import blog.models
+from django.db import migrations
+from django.db.models import F
+
+
+def fill_updated_at(apps, schema_editor):
+    for name in ('Category', 'Comment', 'Location', 'Post'):
+        apps.get_model('blog', name).objects.update(
+            updated_at=F('created_at')
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_post_image_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='updated_at',
+            field=blog.models.ModificationDateTimeField(auto_now=True, db_index=True, verbose_name='Изменено'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='updated_at',
+            field=blog.models.ModificationDateTimeField(auto_now=True, db_index=True, verbose_name='Изменено'),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='updated_at',
+            field=blog.models.ModificationDateTimeField(auto_now=True, db_index=True, verbose_name='Изменено'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='updated_at',
+            field=blog.models.ModificationDateTimeField(auto_now=True, db_index=True, verbose_name='Изменено'),
+        ),
+        migrations.RunPython(fill_updated_at, migrations.RunPython.noop),
+    ]
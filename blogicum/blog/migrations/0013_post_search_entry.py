@@ -0,0 +1,31 @@
+# Generated by Django 3.2.16 on 2026-10-17 05:47
+
+import blog.models
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_post_updated_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostSearchEntry',
+            fields=[
+                ('post', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('title', models.TextField(verbose_name='Заголовок')),
+                ('text', models.TextField(verbose_name='Текст')),
+                ('document', blog.models.FullTextDocumentField(db_column='blog_post_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'verbose_name': 'запись поискового индекса',
+                'verbose_name_plural': 'Поисковый индекс',
+                'db_table': 'blog_post_fts',
+                'managed': False,
+            },
+        ),
+    ]
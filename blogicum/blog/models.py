@@ -1,12 +1,60 @@
 from django.db import models
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
 from blog.constants import TITLE_LENGTH, TITLE_STR_LENGTH
+from blog.storage import post_image_storage
 
 User = get_user_model()
 
 
+class ModificationDateTimeField(models.DateTimeField):
+    """Время последнего изменения строки, с индексом для выборок по нему."""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('auto_now', True)
+        kwargs.setdefault('db_index', True)
+        super().__init__(*args, **kwargs)
+
+
+class FullTextDocumentField(models.TextField):
+    """
+    Скрытый столбец FTS5 с именем таблицы: по нему ищут с MATCH.
+
+    Поиск — лукап match: filter(document__match=выражение FTS5).
+    """
+
+
+@FullTextDocumentField.register_lookup
+class FullTextMatch(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+class PublishedQuerySet(models.QuerySet):
+    """Набор запросов, который отмечает время изменения и при UPDATE."""
+
+    def update(self, **kwargs):
+        kwargs.setdefault('updated_at', timezone.now())
+        return super().update(**kwargs)
+
+    def changed_since(self, moment):
+        """
+        Строки, изменённые после moment, от давних к свежим.
+
+        Удаления так не найти; пачками такие строки обходит
+        blog.paginators.iter_batches(..., field='updated_at').
+        """
+        return self.filter(updated_at__gt=moment).order_by('updated_at', 'pk')
+
+
 class PublishedModel(models.Model):
     """Абстрактная модель для моделей."""
 
@@ -19,6 +67,9 @@ class PublishedModel(models.Model):
         auto_now_add=True,
         verbose_name='Добавлено'
     )
+    updated_at = ModificationDateTimeField(verbose_name='Изменено')
+
+    objects = PublishedQuerySet.as_manager()
 
     class Meta:
         abstract = True
@@ -68,6 +119,45 @@ class Location(PublishedModel):
         return self.name[:TITLE_STR_LENGTH]
 
 
+class PostQuerySet(PublishedQuerySet):
+    """Набор запросов для публикаций."""
+
+    @staticmethod
+    def published_condition():
+        return Q(
+            is_published=True,
+            pub_date__lte=timezone.now(),
+            category__is_published=True,
+        )
+
+    def published(self):
+        """Публикации, которые видны всем посетителям."""
+        return self.filter(self.published_condition())
+
+    def next_publication(self):
+        """Ближайшая дата отложенной публикации или None."""
+        return self.filter(
+            is_published=True,
+            pub_date__gt=timezone.now(),
+            category__is_published=True,
+        ).order_by('pub_date').values_list('pub_date', flat=True).first()
+
+    def visible_to(self, user):
+        """Публикации, которые видит пользователь: опубликованные и свои."""
+        if not user.is_authenticated:
+            return self.published()
+        return self.filter(self.published_condition() | Q(author=user))
+
+    def recount_comments(self):
+        """Пересчитать сохранённое количество комментариев одним UPDATE."""
+        counts = Comment.objects.filter(
+            post=OuterRef('pk')
+        ).order_by().values('post').annotate(
+            total=Count('pk')
+        ).values('total')
+        return self.update(comment_count=Coalesce(Subquery(counts), 0))
+
+
 class Post(PublishedModel):
     """Модель для записей в блоге."""
 
@@ -107,15 +197,58 @@ class Post(PublishedModel):
     image = models.ImageField(
         verbose_name='Изображение',
         upload_to='post_images',
+        storage=post_image_storage,
         blank=True,
         null=True,
     )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев',
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         default_related_name = 'posts'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('pub_date', 'id'),
+                name='post_pub_date_idx',
+            ),
+            models.Index(
+                fields=('pub_date', 'id'),
+                condition=Q(is_published=True),
+                name='post_published_feed_idx',
+            ),
+            models.Index(
+                fields=('category', 'pub_date', 'id'),
+                condition=Q(is_published=True),
+                name='post_category_feed_idx',
+            ),
+            models.Index(
+                fields=('author', 'pub_date', 'id'),
+                name='post_author_feed_idx',
+            ),
+            # Время последней правки и публикации в ленте категории и
+            # автора (RSS, ETag); дату публикации автора покрывает
+            # post_author_feed_idx.
+            models.Index(
+                fields=('category', 'updated_at'),
+                name='post_category_updated_idx',
+            ),
+            models.Index(
+                fields=('category', 'pub_date'),
+                name='post_category_pub_date_idx',
+            ),
+            models.Index(
+                fields=('author', 'updated_at'),
+                name='post_author_updated_idx',
+            ),
+        )
 
     def __str__(self):
         return self.title[:TITLE_STR_LENGTH]
@@ -144,7 +277,115 @@ class Comment(PublishedModel):
     class Meta:
         ordering = ('-created_at',)
         verbose_name = 'комментарий'
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at', 'id'),
+                name='comment_post_created_idx',
+            ),
+        )
         verbose_name_plural = 'Комментарии'
 
     def __str__(self):
         return f'{self.author.username}: {self.text[:TITLE_STR_LENGTH]}'
+
+
+class CategoryFeedEntry(models.Model):
+    """Материализованная лента категории: видимые публикации по дате."""
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='feed_entry',
+        verbose_name='Публикация',
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name='feed_entries',
+        verbose_name='Категория',
+    )
+    pub_date = models.DateTimeField(verbose_name='Дата и время публикации')
+
+    class Meta:
+        verbose_name = 'запись ленты категории'
+        verbose_name_plural = 'Ленты категорий'
+        indexes = (
+            models.Index(
+                fields=('category', 'pub_date', 'post'),
+                name='category_feed_entry_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.category_id}: {self.post_id}'
+
+
+class PostSearchEntry(models.Model):
+    """
+    Строка полнотекстового индекса публикаций.
+
+    Таблицу FTS5 создаёт миграция и наполняет blog.search; она есть только
+    в SQLite, поэтому модель не управляется Django и не удаляется каскадом.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        db_constraint=False,
+        related_name='search_entry',
+        verbose_name='Публикация',
+    )
+    title = models.TextField(verbose_name='Заголовок')
+    text = models.TextField(verbose_name='Текст')
+    document = FullTextDocumentField(db_column='blog_post_fts')
+    # Релевантность совпадения; смысл имеет только вместе с match.
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'blog_post_fts'
+        verbose_name = 'запись поискового индекса'
+        verbose_name_plural = 'Поисковый индекс'
+
+    def __str__(self):
+        return str(self.post_id)
+
+
+class ImageJob(models.Model):
+    """Задание на создание уменьшенных копий изображения публикации."""
+
+    name = models.CharField(
+        max_length=255,
+        unique=True,
+        verbose_name='Изображение',
+    )
+    created_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Поставлено в очередь',
+    )
+    claimed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Взято в работу',
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Неудачных попыток',
+    )
+    error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+
+    class Meta:
+        verbose_name = 'задание обработки изображения'
+        verbose_name_plural = 'Очередь обработки изображений'
+        indexes = (
+            models.Index(
+                fields=('attempts', 'created_at'),
+                name='image_job_queue_idx',
+            ),
+        )
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,140 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from blog.constants import PAGE_CACHE_TIMEOUT
+
+GLOBAL_SCOPE = 'all'
+INDEX_SCOPE = 'index'
+STATIC_SCOPE = 'pages'
+STATS_KEYS = ('page_cache:hits', 'page_cache:misses')
+
+
+def cache_is_shared():
+    """Виден ли кэш другим процессам: в памяти процесса — не виден."""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache)
+
+
+def category_scope(category_slug):
+    return f'category:{category_slug}'
+
+
+def post_scope(post_id):
+    return f'post:{post_id}'
+
+
+def timeout_before(moment, default):
+    """Время жизни записи кэша, которая должна устареть к моменту moment."""
+    if moment is None:
+        return default
+    seconds = (moment - timezone.now()).total_seconds()
+    return max(1, min(default, int(seconds) + 1))
+
+
+def _generation_key(scope):
+    return f'page_cache:generation:{scope}'
+
+
+def get_generation(scope):
+    # Начальное значение — текущее время: если ключ поколения вытеснен из
+    # кэша, новое поколение не совпадёт со старыми страницами.
+    return cache.get_or_set(_generation_key(scope), time.time_ns, None)
+
+
+def invalidate_pages(*scopes):
+    """Сбросить кэш страниц областей scopes; без аргументов — весь кэш."""
+    for scope in scopes or (GLOBAL_SCOPE,):
+        try:
+            cache.incr(_generation_key(scope))
+        except ValueError:
+            pass
+
+
+def page_cache_key(request, scope):
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return (
+        f'page_cache:page:{get_generation(GLOBAL_SCOPE)}'
+        f':{scope}:{get_generation(scope)}:{path}'
+    )
+
+
+def _count(key):
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def get_stats():
+    hits, misses = (cache.get(key, 0) for key in STATS_KEYS)
+    return {'hits': hits, 'misses': misses}
+
+
+def reset_stats():
+    cache.delete_many(STATS_KEYS)
+
+
+def cache_page_for_anonymous(scope, scheduled=None):
+    """
+    Кэшировать страницу для анонимных посетителей.
+
+    scope — строка или функция от аргументов view, возвращающая область
+    кэша; сигналы моделей сбрасывают страницы по областям.
+    scheduled — функция от аргументов view, возвращающая публикации
+    страницы; кэш истекает к ближайшей отложенной из них.
+    Декоратор ставится снаружи condition(): ETag и Last-Modified
+    сохраняются вместе со страницей, и на попадание в кэш ответ 304
+    отдаётся по ним без запросов к базе.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (
+                request.method not in ('GET', 'HEAD')
+                or request.user.is_authenticated
+            ):
+                return view(request, *args, **kwargs)
+            key = page_cache_key(
+                request, scope(**kwargs) if callable(scope) else scope
+            )
+            response = cache.get(key)
+            if response is not None:
+                _count(STATS_KEYS[0])
+                response['X-Page-Cache'] = 'HIT'
+                return get_conditional_response(
+                    request,
+                    etag=response.get('ETag'),
+                    last_modified=parse_http_date_safe(
+                        response.get('Last-Modified')
+                    ),
+                    response=response,
+                )
+            _count(STATS_KEYS[1])
+            response = view(request, *args, **kwargs)
+            if response.status_code != 200 or response.cookies:
+                return response
+
+            timeout = PAGE_CACHE_TIMEOUT
+            if scheduled is not None:
+                timeout = timeout_before(
+                    scheduled(**kwargs).next_publication(), timeout
+                )
+
+            def store(response):
+                cache.set(key, response, timeout)
+
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.add_post_render_callback(store)
+            else:
+                store(response)
+            response['X-Page-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
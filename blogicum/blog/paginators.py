@@ -0,0 +1,266 @@
+import binascii
+from collections.abc import Sequence
+from datetime import datetime
+
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+from django.utils.translation import gettext_lazy as _
+
+FORWARD = 'n'
+BACKWARD = 'p'
+ESTIMATE_SQL = {
+    # Первое число stat — строки индекса; у частичных индексов их меньше,
+    # чем в таблице, поэтому берётся наибольшее.
+    'sqlite': (
+        'SELECT MAX(CAST(stat AS INTEGER)) FROM sqlite_stat1 WHERE tbl = %s'
+    ),
+    'postgresql': 'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+}
+
+
+def estimate_row_count(model, using='default'):
+    """Оценка числа строк таблицы из статистики БД или None."""
+    connection = connections[using]
+    sql = ESTIMATE_SQL.get(connection.vendor)
+    if sql is None:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [model._meta.db_table])
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    if not row or row[0] is None:
+        return None
+    estimate = int(str(row[0]).split()[0])
+    return estimate if estimate > 0 else None
+
+
+def _key(row, name):
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+def iter_batches(queryset, batch_size, field=None, after=None):
+    """
+    Обойти queryset пачками по возрастанию (field, pk) без OFFSET.
+
+    Каждая пачка — отдельный запрос от ключа последней строки, поэтому
+    обход не замедляется к концу таблицы и не держит открытый курсор.
+    Строки могут быть и словарями из values(), если в них есть ключи.
+    after — ключ, после которого продолжить прерванный обход.
+    """
+    pk = queryset.model._meta.pk.attname
+    fields = (field, pk) if field else (pk,)
+    queryset = queryset.order_by(*fields)
+    last = after
+    while True:
+        batch = queryset
+        if last is not None and field:
+            batch = batch.filter(
+                Q(**{f'{field}__gt': last[0]})
+                | Q(**{field: last[0], f'{pk}__gt': last[1]})
+            )
+        elif last is not None:
+            batch = batch.filter(**{f'{pk}__gt': last[0]})
+        batch = list(batch[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last = tuple(_key(batch[-1], name) for name in fields)
+
+
+class KeysetPage(Sequence):
+    """Страница пагинатора по курсору."""
+
+    is_keyset = True
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<KeysetPage of {len(self)} items>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next and bool(self.object_list)
+
+    def has_previous(self):
+        return self._has_previous and bool(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if not self.has_next():
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1], FORWARD)
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous():
+            return None
+        return self.paginator.encode_cursor(self.object_list[0], BACKWARD)
+
+
+class KeysetPaginator:
+    """
+    Пагинатор по курсору (field, pk).
+
+    В отличие от django.core.paginator.Paginator не делает ни OFFSET,
+    ни COUNT(*): страница выбирается условием по ключу последней
+    показанной записи, поэтому её стоимость не зависит от глубины.
+    lookups — пара выражений, по которым фильтровать и сортировать, если
+    ключ хранится не в самих полях (field, pk), а, например, в связанной
+    таблице с теми же значениями.
+    """
+
+    def __init__(self, object_list, per_page, field='pub_date',
+                 descending=True, lookups=None):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.field = field
+        self.descending = descending
+        self.lookups = lookups or (field, 'pk')
+
+    def encode_cursor(self, obj, direction):
+        value = _key(obj, self.field).isoformat()
+        pk = _key(obj, self.object_list.model._meta.pk.attname)
+        return urlsafe_base64_encode(
+            f'{direction}|{value}|{pk}'.encode()
+        )
+
+    def cursor_from_value(self, value):
+        """Курсор, после которого идут записи со значением поля за value."""
+        return urlsafe_base64_encode(
+            f'{FORWARD}|{value.isoformat()}|0'.encode()
+        )
+
+    def decode_cursor(self, cursor):
+        try:
+            direction, value, pk = force_str(
+                urlsafe_base64_decode(cursor)
+            ).split('|')
+            value = datetime.fromisoformat(value)
+            pk = int(pk)
+        except (binascii.Error, TypeError, UnicodeDecodeError, ValueError):
+            return None
+        if direction not in (FORWARD, BACKWARD):
+            return None
+        return direction, value, pk
+
+    def _ordering(self, reverse=False):
+        prefix = '-' if self.descending != reverse else ''
+        return tuple(f'{prefix}{lookup}' for lookup in self.lookups)
+
+    def _after(self, value, pk, reverse=False):
+        lookup = 'lt' if self.descending != reverse else 'gt'
+        field, pk_field = self.lookups
+        return (
+            Q(**{f'{field}__{lookup}': value})
+            | Q(**{field: value, f'{pk_field}__{lookup}': pk})
+        )
+
+    def get_page(self, cursor=None):
+        """Вернуть страницу по курсору; неверный курсор — первая страница."""
+        decoded = self.decode_cursor(cursor) if cursor else None
+        if decoded is None:
+            rows = list(
+                self.object_list.order_by(*self._ordering())
+                [:self.per_page + 1]
+            )
+            return KeysetPage(
+                rows[:self.per_page], self,
+                has_next=len(rows) > self.per_page, has_previous=False,
+            )
+        direction, value, pk = decoded
+        reverse = direction == BACKWARD
+        rows = list(
+            self.object_list.filter(self._after(value, pk, reverse))
+            .order_by(*self._ordering(reverse))[:self.per_page + 1]
+        )
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if reverse:
+            if not rows:
+                return self.get_page()
+            rows.reverse()
+            return KeysetPage(
+                rows, self, has_next=True, has_previous=has_more,
+            )
+        return KeysetPage(rows, self, has_next=has_more, has_previous=True)
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Пагинатор, который для неотфильтрованной таблицы не считает строки.
+
+    Число строк берётся из статистики планировщика (ANALYZE), а точный
+    COUNT(*) выполняется, только если статистики нет или есть фильтры.
+    Статистика может отставать от таблицы, поэтому оценка только
+    показывается: страница проверяется по своим строкам, а число страниц
+    не меньше уже увиденных строк и следующей за ними страницы.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._seen = 0
+
+    @cached_property
+    def estimate(self):
+        query = self.object_list.query
+        if query.where:
+            return None
+        return estimate_row_count(query.model, self.object_list.db)
+
+    @cached_property
+    def exact_count(self):
+        return self.object_list.count()
+
+    @property
+    def count(self):
+        if self.estimate is None:
+            return self.exact_count
+        return max(self.estimate, self._seen)
+
+    @property
+    def num_pages(self):
+        return Paginator.num_pages.func(self)
+
+    def validate_number(self, number):
+        if self.estimate is None:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(_('That page number is not an integer'))
+        if number < 1:
+            raise EmptyPage(_('That page number is less than 1'))
+        return number
+
+    def page(self, number):
+        if self.estimate is None:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        rows = self.object_list[bottom:top]
+        count = len(rows)
+        if not count and number > 1:
+            raise EmptyPage(_('That page contains no results'))
+        self._seen = bottom + count
+        if count == self.per_page and self.object_list[top:top + 1].exists():
+            self._seen += 1
+        return self._get_page(rows, number, self)
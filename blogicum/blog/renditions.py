@@ -0,0 +1,120 @@
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from blog.constants import RENDITION_QUALITY, RENDITION_WIDTHS
+from blog.models import Post
+
+RENDITIONS_DIR = 'renditions'
+
+
+def image_storage():
+    """Хранилище изображений публикаций: копии лежат рядом с исходниками."""
+    return Post._meta.get_field('image').storage
+
+
+def rendition_name(name, width):
+    """Путь копии изображения name шириной width в хранилище."""
+    directory, filename = posixpath.split(name)
+    return posixpath.join(
+        directory, RENDITIONS_DIR, str(width), f'{filename}.jpg'
+    )
+
+
+def original_name(name):
+    """Имя изображения, копией которого является name, или None."""
+    head, filename = posixpath.split(name)
+    head, width = posixpath.split(head)
+    directory, marker = posixpath.split(head)
+    if marker != RENDITIONS_DIR or not width.isdigit():
+        return None
+    if not filename.endswith('.jpg'):
+        return None
+    return posixpath.join(directory, filename[:-len('.jpg')])
+
+
+def _flatten(image):
+    if image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info:
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def _encode(image, width):
+    if image.width > width:
+        image = image.resize(
+            (width, max(1, round(image.height * width / image.width))),
+            Image.Resampling.LANCZOS,
+        )
+    buffer = BytesIO()
+    image.save(
+        buffer, 'JPEG',
+        quality=RENDITION_QUALITY, optimize=True, progressive=True,
+    )
+    return buffer.getvalue()
+
+
+def _save_as(storage, name, content):
+    # Хранилище изображений само выбирает имя по содержимому, а копии
+    # должны лежать под именем, выведенным из имени исходника.
+    save = getattr(storage, 'save_as', storage.save)
+    return save(name, content)
+
+
+def make_renditions(name, storage=None):
+    """
+    Создать копии изображения name всех ширин RENDITION_WIDTHS.
+
+    Копии перекодируются в JPEG без EXIF, с учётом поворота снимка;
+    изображения уже копии не увеличиваются. Самая широкая копия пишется
+    последней: по её наличию шаблоны решают, готов ли набор.
+    """
+    storage = storage or image_storage()
+    with storage.open(name) as file:
+        image = Image.open(file)
+        image.draft('RGB', (max(RENDITION_WIDTHS),) * 2)
+        image = _flatten(ImageOps.exif_transpose(image))
+    names = []
+    for width in sorted(RENDITION_WIDTHS):
+        target = rendition_name(name, width)
+        storage.delete(target)
+        names.append(
+            _save_as(storage, target, ContentFile(_encode(image, width)))
+        )
+    return names
+
+
+def try_make_renditions(name):
+    """Как make_renditions, но вместо исключения вернуть текст ошибки."""
+    try:
+        make_renditions(name)
+    except (OSError, Image.DecompressionBombError) as error:
+        return f'{name}: {error}'
+    return None
+
+
+def delete_renditions(name, storage=None):
+    """Удалить копии изображения name."""
+    storage = storage or image_storage()
+    for width in RENDITION_WIDTHS:
+        storage.delete(rendition_name(name, width))
+
+
+def has_renditions(name, storage=None):
+    storage = storage or image_storage()
+    return storage.exists(rendition_name(name, max(RENDITION_WIDTHS)))
+
+
+def srcset(name, storage=None):
+    """Значение srcset для копий изображения или '', если их ещё нет."""
+    storage = storage or image_storage()
+    if not has_renditions(name, storage):
+        return ''
+    return ', '.join(
+        f'{storage.url(rendition_name(name, width))} {width}w'
+        for width in sorted(RENDITION_WIDTHS)
+    )
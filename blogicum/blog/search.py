@@ -0,0 +1,122 @@
+import re
+
+from django.db import connection, transaction
+from django.db.models import F, Q
+
+from blog.models import PostSearchEntry
+from blog.paginators import iter_batches
+
+FTS_TABLE = PostSearchEntry._meta.db_table
+INSERT_SQL = f'INSERT INTO {FTS_TABLE} (rowid, title, text) VALUES '
+INSERT_ROW_SQL = '(%s, %s, %s)'
+DELETE_SQL = f'DELETE FROM {FTS_TABLE} WHERE rowid = %s'
+# По три параметра на строку: пачка укладывается и в старый предел SQLite
+# в 999 параметров на запрос.
+INDEX_BATCH_SIZE = 300
+WORD_RE = re.compile(r'\w+')
+
+
+def fts_available():
+    return connection.vendor == 'sqlite'
+
+
+def index_post(post):
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(DELETE_SQL, [post.pk])
+        cursor.execute(
+            INSERT_SQL + INSERT_ROW_SQL, [post.pk, post.title, post.text]
+        )
+
+
+def remove_post(post_id):
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(DELETE_SQL, [post_id])
+
+
+def _insert_rows(cursor, rows):
+    cursor.execute(
+        INSERT_SQL + ', '.join([INSERT_ROW_SQL] * len(rows)),
+        [
+            value for row in rows
+            for value in (row['id'], row['title'], row['text'])
+        ],
+    )
+
+
+def _index_batches(posts):
+    return iter_batches(
+        posts.values('id', 'title', 'text'), INDEX_BATCH_SIZE
+    )
+
+
+def index_posts(posts):
+    """Переиндексировать пачку публикаций posts."""
+    if not fts_available():
+        return
+    with transaction.atomic(), connection.cursor() as cursor:
+        for rows in _index_batches(posts):
+            ids = [row['id'] for row in rows]
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid IN '
+                f'({", ".join(["%s"] * len(ids))})',
+                ids,
+            )
+            _insert_rows(cursor, rows)
+
+
+def rebuild_index(posts):
+    """
+    Заново наполнить полнотекстовый индекс публикациями posts.
+
+    Всё в одной транзакции: вне её каждая строка фиксировалась бы
+    отдельно, а поиск до конца перестройки ничего бы не находил.
+    """
+    if not fts_available():
+        return
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        for rows in _index_batches(posts):
+            _insert_rows(cursor, rows)
+
+
+def to_fts_query(query):
+    """
+    Превратить пользовательский запрос в безопасное выражение FTS5.
+
+    Каждое слово берётся в кавычки, последнее ищется как префикс:
+    так спецсимволы FTS5 из запроса не ломают разбор.
+    """
+    words = WORD_RE.findall(query)
+    if not words:
+        return ''
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def search_posts(posts, query):
+    """Отфильтровать posts по запросу и отсортировать по релевантности."""
+    fts_query = to_fts_query(query)
+    if not fts_query:
+        return posts.none()
+    if not fts_available():
+        condition = Q()
+        for word in WORD_RE.findall(query):
+            condition &= Q(title__icontains=word) | Q(text__icontains=word)
+        return posts.filter(condition)
+    # Соединение с индексом, а не коррелированный подзапрос за rank: тот
+    # заново выполнял бы поиск для каждой найденной строки.
+    return posts.filter(search_entry__document__match=fts_query).annotate(
+        search_rank=F('search_entry__rank'),
+    ).order_by('search_rank', '-pub_date')
+
+
+def matching_ids(query):
+    """Подзапрос id публикаций, подходящих под запрос, — для админки."""
+    return PostSearchEntry.objects.filter(
+        document__match=to_fts_query(query)
+    ).values('post_id')
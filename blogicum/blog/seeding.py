@@ -0,0 +1,228 @@
+"""
+Синтетические данные блога для проверки производительности.
+
+Строки создаются кусками по SEED_CHUNK_SIZE. Каждый кусок получает свой
+генератор случайных чисел от зерна, вида строк и номера куска, а первичные
+ключи назначаются заранее, поэтому при том же зерне и той же пустой базе
+данные одинаковы при любом числе процессов и порядке обработки кусков.
+Дочерние процессы только строят строки, в базу их пишет основной.
+Даты отсчитываются от момента запуска.
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Max
+from faker import Faker
+
+from blog.models import Category, Comment, Location, Post
+from blog.transfer import bulk_create_keeping_created_at, sync_bulk_posts
+
+User = get_user_model()
+
+SEED_CHUNK_SIZE = 1000
+FAKER_LOCALE = 'ru_RU'
+# Сколько дней назад начинается история блога.
+HISTORY_DAYS = 365 * 3
+# На сколько дней вперёд запланированы отложенные публикации.
+SCHEDULE_DAYS = 30
+# Степени распределений: чем больше, тем сильнее строки сосредоточены у
+# первых авторов, категорий и самых свежих публикаций.
+AUTHOR_SKEW = 3
+COMMENTER_SKEW = 2
+CATEGORY_SKEW = 2
+HOT_POST_SKEW = 4
+# Доля публикаций без местоположения и среднее время до комментария, ч.
+NO_LOCATION_SHARE = 0.3
+COMMENT_DELAY_HOURS = 24
+# В порядке зависимостей: куски следующего вида ссылаются на предыдущие.
+KINDS = ('categories', 'locations', 'users', 'posts', 'comments')
+MODELS = {
+    'categories': Category,
+    'locations': Location,
+    'users': User,
+    'posts': Post,
+    'comments': Comment,
+}
+
+
+def make_plan(counts, seed, now, unpublished_share, scheduled_share,
+              password):
+    """
+    Параметры генерации, общие для всех кусков.
+
+    bases — наибольший pk каждой модели до запуска: новые строки идут за
+    ним, и ссылки между ними известны без запросов к базе.
+    """
+    bases = {
+        kind: model._default_manager.aggregate(value=Max('pk'))['value'] or 0
+        for kind, model in MODELS.items()
+    }
+    return {
+        'counts': counts,
+        'bases': bases,
+        'seed': seed,
+        'now': now,
+        'unpublished_share': unpublished_share,
+        'scheduled': int(counts['posts'] * scheduled_share),
+        'password': password,
+    }
+
+
+def tasks(plan, kind):
+    return [
+        (kind, start, min(start + SEED_CHUNK_SIZE, plan['counts'][kind]), plan)
+        for start in range(0, plan['counts'][kind], SEED_CHUNK_SIZE)
+    ]
+
+
+def _skewed(rng, count, skew):
+    """Индекс от 0 до count - 1; малые индексы выпадают чаще."""
+    return int(count * rng.random() ** skew)
+
+
+def _pk(plan, kind, index):
+    return plan['bases'][kind] + index + 1
+
+
+def _hidden(rng, plan):
+    return rng.random() < plan['unpublished_share']
+
+
+def post_pub_date(plan, index):
+    """
+    Дата публикации по её номеру.
+
+    Публикации идут по порядку ключей от начала истории до момента запуска,
+    последние plan['scheduled'] из них отложены на будущее.
+    """
+    published = plan['counts']['posts'] - plan['scheduled']
+    if index >= published:
+        return plan['now'] + timedelta(
+            days=SCHEDULE_DAYS * (index - published + 1) / plan['scheduled']
+        )
+    return plan['now'] - timedelta(
+        days=HISTORY_DAYS * (published - index) / published
+    )
+
+
+def _categories(fake, plan, indexes):
+    for index in indexes:
+        pk = _pk(plan, 'categories', index)
+        yield Category(
+            pk=pk,
+            title=fake.sentence(nb_words=2)[:-1],
+            description=fake.paragraph(),
+            slug=f'category-{pk}',
+            is_published=not _hidden(fake.random, plan),
+            created_at=plan['now'] - timedelta(days=HISTORY_DAYS),
+        )
+
+
+def _locations(fake, plan, indexes):
+    for index in indexes:
+        yield Location(
+            pk=_pk(plan, 'locations', index),
+            name=fake.city(),
+            is_published=not _hidden(fake.random, plan),
+            created_at=plan['now'] - timedelta(days=HISTORY_DAYS),
+        )
+
+
+def _users(fake, plan, indexes):
+    for index in indexes:
+        pk = _pk(plan, 'users', index)
+        yield User(
+            pk=pk,
+            username=f'user{pk}',
+            first_name=fake.first_name(),
+            last_name=fake.last_name(),
+            email=f'user{pk}@example.com',
+            password=plan['password'],
+            date_joined=plan['now'] - timedelta(
+                days=fake.random.uniform(0, HISTORY_DAYS)
+            ),
+        )
+
+
+def _posts(fake, plan, indexes):
+    rng, counts = fake.random, plan['counts']
+    for index in indexes:
+        pub_date = post_pub_date(plan, index)
+        location = None
+        if counts['locations'] and rng.random() >= NO_LOCATION_SHARE:
+            location = _pk(
+                plan, 'locations', rng.randrange(counts['locations'])
+            )
+        yield Post(
+            pk=_pk(plan, 'posts', index),
+            title=fake.sentence()[:-1],
+            text='\n\n'.join(fake.paragraphs(
+                nb=1 + int(rng.expovariate(0.5))
+            )),
+            pub_date=pub_date,
+            created_at=min(pub_date, plan['now']),
+            author_id=_pk(
+                plan, 'users', _skewed(rng, counts['users'], AUTHOR_SKEW)
+            ),
+            category_id=_pk(
+                plan, 'categories',
+                _skewed(rng, counts['categories'], CATEGORY_SKEW),
+            ),
+            location_id=location,
+            is_published=not _hidden(rng, plan),
+        )
+
+
+def _comments(fake, plan, indexes):
+    rng, counts = fake.random, plan['counts']
+    # Комментируют только наступившие публикации, свежие — чаще.
+    published = counts['posts'] - plan['scheduled']
+    for index in indexes:
+        post = published - 1 - _skewed(rng, published, HOT_POST_SKEW)
+        created_at = post_pub_date(plan, post) + timedelta(
+            hours=rng.expovariate(1 / COMMENT_DELAY_HOURS)
+        )
+        yield Comment(
+            pk=_pk(plan, 'comments', index),
+            post_id=_pk(plan, 'posts', post),
+            author_id=_pk(
+                plan, 'users', _skewed(rng, counts['users'], COMMENTER_SKEW)
+            ),
+            text=fake.sentence(nb_words=rng.randint(3, 30)),
+            created_at=min(created_at, plan['now']),
+            is_published=not _hidden(rng, plan),
+        )
+
+
+BUILDERS = {
+    'categories': _categories,
+    'locations': _locations,
+    'users': _users,
+    'posts': _posts,
+    'comments': _comments,
+}
+
+
+def build_chunk(task):
+    """Построить строки одного куска; вызывается и в дочерних процессах."""
+    kind, start, stop, plan = task
+    fake = Faker(FAKER_LOCALE)
+    fake.seed_instance(f'{plan["seed"]}:{kind}:{start}')
+    return list(BUILDERS[kind](fake, plan, range(start, stop)))
+
+
+def save_chunk(kind, objects):
+    """
+    Записать кусок строк.
+
+    Вызывается только в основном процессе: SQLite не пускает двух
+    писателей сразу, и параллельные транзакции падали бы с database is
+    locked.
+    """
+    model = MODELS[kind]
+    with transaction.atomic():
+        bulk_create_keeping_created_at(model, objects)
+        if model is Post:
+            sync_bulk_posts([obj.pk for obj in objects])
+    return len(objects)
@@ -0,0 +1,188 @@
+from threading import local
+
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+
+from blog import category_feeds, image_jobs, renditions, search
+from blog.feed_counts import (
+    category_feed_count_keys,
+    forget_feed_counts,
+    post_feed_count_keys,
+    post_feed_state,
+    shift_feed_counts,
+)
+from blog.models import Category, Comment, Location, Post
+from blog.page_cache import (
+    INDEX_SCOPE, category_scope, invalidate_pages, post_scope
+)
+
+# Удаления в текущем потоке. Сборщик Django сначала шлёт pre_delete всем
+# строкам, потом удаляет их и только затем шлёт post_delete, поэтому
+# публикацию достаточно пересчитать по первому post_delete её комментария.
+_deleting = local()
+
+
+def _deleting_set(name):
+    if not hasattr(_deleting, name):
+        setattr(_deleting, name, set())
+    return getattr(_deleting, name)
+
+
+def invalidate_post_pages(*category_ids):
+    slugs = Category.objects.filter(
+        pk__in=category_ids
+    ).values_list('slug', flat=True)
+    invalidate_pages(INDEX_SCOPE, *map(category_scope, slugs))
+
+
+def invalidate_comment_pages(post_id):
+    invalidate_pages(post_scope(post_id))
+    invalidate_post_pages(*Post.objects.filter(
+        pk=post_id
+    ).values_list('category_id', flat=True))
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+        invalidate_comment_pages(instance.post_id)
+
+
+@receiver(post_save, sender=Comment)
+def invalidate_edited_comment(sender, instance, created, raw=False,
+                              **kwargs):
+    if not created and not raw:
+        invalidate_pages(post_scope(instance.post_id))
+
+
+@receiver(pre_delete, sender=Comment)
+def remember_comment_post(sender, instance, **kwargs):
+    _deleting_set('comment_posts').add(instance.post_id)
+    # Комментарии удаляются раньше публикаций, так что метка удаляемой
+    # публикации, оставшаяся от прерванного удаления, здесь снимается.
+    _deleting_set('posts').discard(instance.post_id)
+
+
+@receiver(post_delete, sender=Comment)
+def recount_comment_post(sender, instance, **kwargs):
+    pending = _deleting_set('comment_posts')
+    if instance.post_id not in pending:
+        return
+    pending.discard(instance.post_id)
+    if instance.post_id in _deleting_set('posts'):
+        return
+    Post.objects.filter(pk=instance.post_id).recount_comments()
+    invalidate_comment_pages(instance.post_id)
+
+
+@receiver(pre_delete, sender=Post)
+def remember_deleted_post(sender, instance, **kwargs):
+    _deleting_set('posts').add(instance.pk)
+
+
+@receiver(pre_save, sender=Post)
+@receiver(pre_delete, sender=Post)
+def remember_post_feed_state(sender, instance, raw=False, **kwargs):
+    instance._feed_state = (
+        post_feed_state(instance.pk) if instance.pk and not raw else None
+    )
+
+
+@receiver(post_save, sender=Post)
+def update_post_feed_counts(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    category_feeds.sync_post(instance.pk)
+    new_state = post_feed_state(instance.pk)
+    shift_feed_counts(
+        post_feed_count_keys(instance._feed_state),
+        post_feed_count_keys(new_state),
+    )
+    invalidate_pages(post_scope(instance.pk))
+    invalidate_post_pages(*(
+        state['category_id'] for state in (instance._feed_state, new_state)
+        if state
+    ))
+
+
+@receiver(post_delete, sender=Post)
+def drop_post_feed_counts(sender, instance, **kwargs):
+    _deleting_set('posts').discard(instance.pk)
+    shift_feed_counts(post_feed_count_keys(instance._feed_state), set())
+    invalidate_pages(post_scope(instance.pk))
+    invalidate_post_pages(instance.category_id)
+
+
+@receiver(pre_save, sender=Category)
+def remember_category_published(sender, instance, raw=False, **kwargs):
+    instance._was_published = Category.objects.filter(
+        pk=instance.pk
+    ).values_list('is_published', flat=True).first()
+
+
+@receiver(post_save, sender=Category)
+def forget_category_feed_counts(sender, instance, raw=False, **kwargs):
+    if not raw and instance._was_published != instance.is_published:
+        category_feeds.sync_category(instance)
+        forget_feed_counts(*category_feed_count_keys(instance))
+
+
+@receiver(pre_delete, sender=Category)
+def forget_deleted_category_feed_counts(sender, instance, **kwargs):
+    forget_feed_counts(*category_feed_count_keys(instance))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_all_pages(sender, raw=False, **kwargs):
+    if not raw:
+        invalidate_pages()
+
+
+@receiver(post_save, sender=Post)
+def index_post_text(sender, instance, **kwargs):
+    search.index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_text(sender, instance, **kwargs):
+    search.remove_post(instance.pk)
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_image(sender, instance, raw=False, **kwargs):
+    instance._old_image = Post.objects.filter(
+        pk=instance.pk
+    ).values_list('image', flat=True).first() if instance.pk else None
+
+
+def forget_unused_image(name):
+    # Файлы и копии удаляет collect_orphan_images: одинаковые загрузки
+    # хранятся в одном файле, и на него могут ссылаться другие публикации.
+    if name and not Post.objects.filter(image=name).exists():
+        image_jobs.discard(name)
+
+
+@receiver(post_save, sender=Post)
+def enqueue_post_image(sender, instance, raw=False, **kwargs):
+    # Копии делает process_image_jobs; до тех пор шаблоны
+    # показывают исходное изображение.
+    old, new = instance._old_image or None, instance.image.name or None
+    if raw or old == new:
+        return
+    forget_unused_image(old)
+    if new and not renditions.has_renditions(new, instance.image.storage):
+        image_jobs.enqueue(new)
+
+
+@receiver(post_delete, sender=Post)
+def forget_post_image(sender, instance, **kwargs):
+    forget_unused_image(instance.image.name)
@@ -0,0 +1,237 @@
+import os
+import tempfile
+import time
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import (
+    ExpressionWrapper, F, IntegerField, Max, OuterRef, Q, Subquery
+)
+from django.http import FileResponse, Http404
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.text import slugify
+from django.views.decorators.http import require_safe
+
+from blog.constants import (
+    SITEMAP_BATCH_SIZE,
+    SITEMAP_CACHE_TIMEOUT,
+    SITEMAP_CHUNK_SIZE,
+    SITEMAP_INDEX_TIMEOUT,
+)
+from blog.models import Category, Post
+from blog.paginators import iter_batches
+
+User = get_user_model()
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+class PostsSection:
+    """
+    Раздел карты сайта.
+
+    Строки раздела делятся на куски по диапазонам chunk_field шириной
+    SITEMAP_CHUNK_SIZE: кусок находится без OFFSET и COUNT, а его
+    адрес не меняется при добавлении и удалении строк. Время изменения
+    куска считается по changes() — включая скрытые строки, чтобы снятие
+    с публикации тоже обновляло файл.
+    """
+
+    name = 'posts'
+    chunk_field = 'pk'
+    uses_categories = True
+
+    def rows(self):
+        return Post.objects.published().values('id', 'pub_date', 'updated_at')
+
+    def changes(self):
+        return Post.objects.all()
+
+    def location(self, row):
+        return reverse('blog:post_detail', args=(row['id'],))
+
+    def lastmod(self, row):
+        return max(row['pub_date'], row['updated_at'])
+
+
+class CategoriesSection(PostsSection):
+    name = 'categories'
+    uses_categories = False
+
+    def rows(self):
+        return Category.objects.filter(is_published=True).values(
+            'id', 'slug', 'updated_at'
+        )
+
+    def changes(self):
+        return Category.objects.all()
+
+    def location(self, row):
+        return reverse('blog:category_posts', args=(row['slug'],))
+
+    def lastmod(self, row):
+        return row['updated_at']
+
+
+class ProfilesSection(PostsSection):
+    name = 'profiles'
+    chunk_field = 'author_id'
+
+    def rows(self):
+        latest = Post.objects.published().filter(
+            author=OuterRef('pk')
+        ).order_by('-pub_date').values('pub_date')[:1]
+        return User.objects.annotate(
+            lastmod=Subquery(latest)
+        ).filter(lastmod__isnull=False).values('id', 'username', 'lastmod')
+
+    def location(self, row):
+        return reverse('blog:profile', args=(row['username'],))
+
+    def lastmod(self, row):
+        return row['lastmod']
+
+
+SECTIONS = {
+    section.name: section
+    for section in (PostsSection(), CategoriesSection(), ProfilesSection())
+}
+
+
+def _chunk_changes(section, chunk=None):
+    """Время последнего изменения кусков раздела: {номер: время}."""
+    changes = section.changes()
+    aggregates = {'updated': Max('updated_at')}
+    if changes.model is Post:
+        aggregates['published'] = Max(
+            'pub_date', filter=Q(pub_date__lte=timezone.now())
+        )
+    if chunk is not None:
+        changes = changes.filter(**_chunk_range(chunk, section.chunk_field))
+    rows = changes.annotate(chunk=ExpressionWrapper(
+        F(section.chunk_field) / SITEMAP_CHUNK_SIZE,
+        output_field=IntegerField(),
+    )).order_by().values('chunk').annotate(**aggregates)
+    categories = None
+    if section.uses_categories:
+        categories = Category.objects.aggregate(
+            value=Max('updated_at')
+        )['value']
+    return {
+        row['chunk']: max(filter(None, (
+            row['updated'], row.get('published'), categories
+        )))
+        for row in rows
+    }
+
+
+def _chunk_range(chunk, field='pk'):
+    return {
+        f'{field}__gte': chunk * SITEMAP_CHUNK_SIZE,
+        f'{field}__lt': (chunk + 1) * SITEMAP_CHUNK_SIZE,
+    }
+
+
+def _lastmod(moment):
+    return timezone.localtime(moment, timezone.utc).strftime(
+        '%Y-%m-%dT%H:%M:%SZ'
+    )
+
+
+def generate_index(request):
+    yield XML_HEADER
+    yield f'<sitemapindex xmlns="{XMLNS}">\n'
+    for section in SECTIONS.values():
+        for chunk, changed in sorted(_chunk_changes(section).items()):
+            location = request.build_absolute_uri(reverse(
+                'blog:sitemap_section', args=(section.name, chunk)
+            ))
+            yield (
+                f'<sitemap><loc>{escape(location)}</loc>'
+                f'<lastmod>{_lastmod(changed)}</lastmod></sitemap>\n'
+            )
+    yield '</sitemapindex>\n'
+
+
+def generate_section(request, section, chunk):
+    yield XML_HEADER
+    yield f'<urlset xmlns="{XMLNS}">\n'
+    # Ключ строк раздела — pk, в тех же границах, что и chunk_field.
+    rows = section.rows().filter(**_chunk_range(chunk))
+    for batch in iter_batches(rows, SITEMAP_BATCH_SIZE):
+        yield ''.join(
+            f'<url><loc>{escape(request.build_absolute_uri(location))}</loc>'
+            f'<lastmod>{_lastmod(section.lastmod(row))}</lastmod></url>\n'
+            for row, location in (
+                (row, section.location(row)) for row in batch
+            )
+        )
+    yield '</urlset>\n'
+
+
+def _cache_path(request, filename):
+    directory = Path(settings.SITEMAP_CACHE_DIR) / slugify(request.get_host())
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / filename
+
+
+def _is_fresh(path, timeout, changed=None):
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return False
+    if time.time() - mtime > timeout:
+        return False
+    return changed is None or mtime >= changed.timestamp()
+
+
+def _write(path, parts):
+    """
+    Записать файл по частям и атомарно подменить им старый.
+
+    Время изменения файла — начало генерации: правка, сделанная во время
+    записи, окажется новее файла и вызовет повторную генерацию.
+    """
+    started = time.time()
+    file = tempfile.NamedTemporaryFile(
+        'w', encoding='utf-8', dir=path.parent, delete=False
+    )
+    try:
+        with file:
+            for part in parts:
+                file.write(part)
+        os.utime(file.name, (started, started))
+        os.replace(file.name, path)
+    except BaseException:
+        os.unlink(file.name)
+        raise
+
+
+def _file_response(path):
+    return FileResponse(open(path, 'rb'), content_type='application/xml')
+
+
+@require_safe
+def sitemap_index(request):
+    path = _cache_path(request, 'index.xml')
+    if not _is_fresh(path, SITEMAP_INDEX_TIMEOUT):
+        _write(path, generate_index(request))
+    return _file_response(path)
+
+
+@require_safe
+def sitemap_section(request, section, chunk):
+    section = SECTIONS.get(section)
+    if section is None:
+        raise Http404
+    changed = _chunk_changes(section, chunk).get(chunk)
+    if changed is None:
+        raise Http404
+    path = _cache_path(request, f'{section.name}-{chunk}.xml')
+    if not _is_fresh(path, SITEMAP_CACHE_TIMEOUT, changed):
+        _write(path, generate_section(request, section, chunk))
+    return _file_response(path)
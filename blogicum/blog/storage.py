@@ -0,0 +1,69 @@
+import hashlib
+import os
+import posixpath
+import re
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+HASH_CHUNK_SIZE = 64 * 1024
+CONTENT_NAME_RE = re.compile(r'(^|/)([0-9a-f]{2})/\2[0-9a-f]{62}(\.\w+)?$')
+
+
+def is_content_addressed(name):
+    """Имя выдано ContentAddressedStorage: содержимое файла не меняется."""
+    return bool(CONTENT_NAME_RE.search(name))
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Хранилище, где имя файла — SHA-256 его содержимого.
+
+    Одинаковые загрузки ложатся в один файл: если файл с таким хэшем уже
+    есть, он не переписывается, а только получает новое время изменения.
+    Файлы раскладываются по подкаталогам по первым символам хэша, чтобы
+    каталоги не разрастались. Удалять файлы можно только вместе со всеми
+    ссылками на них — см. команду collect_orphan_images.
+    """
+
+    def content_name(self, name, content):
+        digest = hashlib.sha256()
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        for chunk in content.chunks(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        digest = digest.hexdigest()
+        directory, filename = posixpath.split(name)
+        extension = posixpath.splitext(filename)[1].lower()
+        return posixpath.join(directory, digest[:2], digest + extension)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = self.content_name(name, content)
+        if self.exists(name):
+            # Повторная загрузка заново отсчитывает срок, в течение которого
+            # collect_orphan_images не трогает файл без ссылок.
+            os.utime(self.path(name))
+            return name
+        return super().save(name, content, max_length)
+
+    def save_as(self, name, content, max_length=None):
+        """
+        Сохранить файл под именем name, не выводя его из содержимого.
+
+        Для производных файлов, чьё имя выводится из имени исходника,
+        например уменьшенных копий.
+        """
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        return super().save(name, content, max_length)
+
+
+post_image_storage = ContentAddressedStorage()
@@ -0,0 +1,43 @@
+from django import template
+from django.utils.html import format_html
+
+from blog import renditions
+from blog.constants import (
+    PAGINATOR_ON_EACH_SIDE, PAGINATOR_ON_ENDS, RENDITION_SIZES
+)
+
+register = template.Library()
+
+
+@register.filter
+def elided_page_range(page_obj):
+    """Номера страниц вокруг текущей и по краям, остальное — многоточие."""
+    return page_obj.paginator.get_elided_page_range(
+        page_obj.number,
+        on_each_side=PAGINATOR_ON_EACH_SIDE,
+        on_ends=PAGINATOR_ON_ENDS,
+    )
+
+
+@register.simple_tag(takes_context=True)
+def url_replace(context, **kwargs):
+    """Строка запроса текущей страницы с заменёнными параметрами.
+
+    Параметр со значением None убирается из строки запроса.
+    """
+    query = context['request'].GET.copy()
+    for key, value in kwargs.items():
+        if value is None:
+            query.pop(key, None)
+        else:
+            query[key] = value
+    return query.urlencode()
+
+
+@register.simple_tag
+def image_srcset(image):
+    """Атрибуты srcset и sizes для уменьшенных копий изображения."""
+    value = renditions.srcset(image.name, image.storage) if image else ''
+    if not value:
+        return ''
+    return format_html(' srcset="{}" sizes="{}"', value, RENDITION_SIZES)
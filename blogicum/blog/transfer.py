@@ -0,0 +1,231 @@
+"""
+Выгрузка и загрузка данных блога в сжатый JSONL.
+
+Каждая модель лежит в своём файле <app>.<model>.jsonl.gz: по строке JSON
+на запись, ключи — имена столбцов. Выгрузка идёт пачками по первичному
+ключу, каждая пачка дописывается отдельным членом gzip; загрузка — пачками
+bulk_create в своей транзакции. После каждой пачки в контрольную точку
+записывается, докуда дошли, поэтому прерванную работу можно продолжить.
+Файлы изображений не переносятся: их копируют вместе с MEDIA_ROOT.
+"""
+import gzip
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import Q
+
+from blog import category_feeds, search
+from blog.feed_counts import forget_all_feed_counts
+from blog.models import Category, Comment, Location, Post
+from blog.page_cache import invalidate_pages
+from blog.paginators import iter_batches
+
+User = get_user_model()
+
+# В порядке зависимостей: связанные строки загружаются раньше ссылок.
+MODELS = (User, Category, Location, Post, Comment)
+EXPORT_CHECKPOINT = 'export-checkpoint.json'
+IMPORT_CHECKPOINT = 'import-checkpoint.json'
+COMPRESS_LEVEL = 6
+
+
+class TransferEncoder(DjangoJSONEncoder):
+    """В отличие от DjangoJSONEncoder, не отбрасывает микросекунды."""
+
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def data_path(directory, model):
+    return Path(directory) / f'{model._meta.label_lower}.jsonl.gz'
+
+
+def read_checkpoint(path):
+    try:
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def write_checkpoint(path, state):
+    """Записать контрольную точку атомарно: сбой не оставит её пустой."""
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as file:
+        json.dump(state, file, cls=DjangoJSONEncoder)
+    os.replace(temporary, path)
+
+
+def _columns(model):
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+def export_rows(model, since=None):
+    """Строки модели для выгрузки; since — только изменённые после него."""
+    rows = model._default_manager.values(*_columns(model))
+    if since is None:
+        return rows
+    if model is User:
+        # У пользователей нет времени изменения: берём новых и заходивших.
+        return rows.filter(Q(date_joined__gt=since) | Q(last_login__gt=since))
+    return rows.filter(updated_at__gt=since)
+
+
+def export_model(directory, model, state, batch_size, since=None,
+                 save=None):
+    """
+    Выгрузить модель, продолжая с состояния state.
+
+    state — словарь контрольной точки модели: последний выгруженный pk,
+    число строк и размер файла после последней записанной пачки. Хвост,
+    дописанный после неё до сбоя, отрезается.
+    """
+    path = data_path(directory, model)
+    with open(path, 'ab') as file:
+        file.truncate(state.get('size', 0))
+    last = state.get('last')
+    for batch in iter_batches(
+        export_rows(model, since), batch_size,
+        after=None if last is None else (last,),
+    ):
+        with gzip.open(
+            path, 'at', compresslevel=COMPRESS_LEVEL, encoding='utf-8'
+        ) as file:
+            file.writelines(
+                json.dumps(row, cls=TransferEncoder, ensure_ascii=False)
+                + '\n'
+                for row in batch
+            )
+        state['last'] = batch[-1][model._meta.pk.attname]
+        state['rows'] = state.get('rows', 0) + len(batch)
+        state['size'] = path.stat().st_size
+        if save:
+            save()
+    state['done'] = True
+    if save:
+        save()
+    return state.get('rows', 0)
+
+
+def bulk_create_keeping_created_at(model, objects, batch_size=None):
+    """
+    bulk_create, после которого время создания строк остаётся исходным.
+
+    auto_now_add подменяет его текущим при вставке. Поле модели общее для
+    всего процесса, поэтому оно не перенастраивается, а исходные значения
+    записываются вторым запросом. Время изменения при этом ставится
+    текущее: для этой базы строка изменилась в момент загрузки, и кэши
+    лент и карты сайта это заметят.
+    """
+    manager = model._default_manager
+    fields = [
+        field.attname for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    originals = [
+        model(pk=obj.pk, **{name: getattr(obj, name) for name in fields})
+        for obj in objects
+    ]
+    manager.bulk_create(objects, batch_size=batch_size)
+    if fields and originals:
+        manager.bulk_update(originals, fields, batch_size=batch_size)
+
+
+def sync_bulk_posts(post_ids):
+    """
+    Обновить ленты категорий и поисковый индекс для публикаций post_ids.
+
+    bulk_create и bulk_update не шлют сигналов, поэтому после них
+    производные данные обновляются этой функцией.
+    """
+    category_feeds.sync_posts(post_ids)
+    search.index_posts(Post.objects.filter(pk__in=post_ids))
+
+
+def _read_batches(path, batch_size, skip=0):
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        batch = []
+        for number, line in enumerate(file):
+            if number < skip:
+                continue
+            batch.append(json.loads(line))
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def load_batch(model, rows, batch_size):
+    """
+    Вставить новые строки пачки и обновить уже существующие.
+
+    Повторная загрузка той же пачки ничего не ломает, поэтому пачку,
+    загруженную до сбоя, но не отмеченную в контрольной точке, можно
+    загрузить снова.
+    """
+    manager = model._default_manager
+    pk = model._meta.pk.attname
+    objects = [model(**row) for row in rows]
+    existing = set(manager.filter(
+        pk__in=[row[pk] for row in rows]
+    ).values_list('pk', flat=True))
+    fields = [
+        name for name in _columns(model)
+        if name not in (pk, 'updated_at')
+    ]
+    bulk_create_keeping_created_at(
+        model, [obj for obj in objects if obj.pk not in existing], batch_size
+    )
+    manager.bulk_update(
+        [obj for obj in objects if obj.pk in existing], fields,
+        batch_size=batch_size,
+    )
+    if model is Post:
+        sync_bulk_posts([obj.pk for obj in objects])
+    elif model is Category:
+        category_feeds.rebuild(categories=[obj.pk for obj in objects])
+
+
+def import_model(directory, model, state, batch_size, save=None):
+    """Загрузить модель, пропустив уже загруженные state['lines'] строк."""
+    path = data_path(directory, model)
+    if not path.exists():
+        return 0
+    loaded = 0
+    for batch in _read_batches(path, batch_size, state.get('lines', 0)):
+        with transaction.atomic():
+            load_batch(model, batch, batch_size)
+        loaded += len(batch)
+        state['lines'] = state.get('lines', 0) + len(batch)
+        if save:
+            save()
+    return loaded
+
+
+def reset_sequences(models=MODELS):
+    """Сдвинуть последовательности ключей за строки, вставленные с pk."""
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def forget_cached_pages():
+    """Сбросить кэш страниц и счётчиков лент после массовой записи."""
+    invalidate_pages()
+    forget_all_feed_counts()
+
+
+def finish_import():
+    """Сдвинуть последовательности ключей и сбросить кэши."""
+    reset_sequences()
+    forget_cached_pages()
@@ -1,12 +1,37 @@
 from django.urls import path, include
 
 from blog.views import UserProfileViews, EditProfileView
-from . import views
+from . import api, feeds, sitemaps, views
 
 app_name = 'blog'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('search/', views.search, name='search'),
+    path('api/posts/', api.posts, name='api_posts'),
+    path(
+        'api/posts/<int:post_id>/',
+        api.post_detail, name='api_post_detail'),
+    path('api/categories/', api.categories, name='api_categories'),
+    path('api/locations/', api.locations, name='api_locations'),
+    path('sitemap.xml', sitemaps.sitemap_index, name='sitemap'),
+    path(
+        'sitemap-<str:section>-<int:chunk>.xml',
+        sitemaps.sitemap_section, name='sitemap_section'),
+    path('feeds/rss/', feeds.latest_posts_rss, name='feed_rss'),
+    path('feeds/atom/', feeds.latest_posts_atom, name='feed_atom'),
+    path(
+        'feeds/category/<slug:category_slug>/rss/',
+        feeds.category_posts_rss, name='category_feed_rss'),
+    path(
+        'feeds/category/<slug:category_slug>/atom/',
+        feeds.category_posts_atom, name='category_feed_atom'),
+    path(
+        'feeds/profile/<str:username>/rss/',
+        feeds.author_posts_rss, name='profile_feed_rss'),
+    path(
+        'feeds/profile/<str:username>/atom/',
+        feeds.author_posts_atom, name='profile_feed_atom'),
     path(
         'auth/',
         include('django.contrib.auth.urls')),
@@ -25,6 +50,9 @@ urlpatterns = [
     path(
         'posts/<int:post_id>/',
         views.post_detail, name='post_detail'),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.post_comments, name='post_comments'),
     path(
         'posts/<int:post_id>/comment/',
         views.add_comment, name='add_comment'),
@@ -1,76 +1,162 @@
-from django.http import Http404
-from django.utils import timezone
+from datetime import datetime, time, timedelta
+
 from django.core.paginator import Paginator
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from django.views.generic import UpdateView, ListView
 from django.views.generic.detail import SingleObjectMixin
 from django.contrib.auth.models import User
-from django.db.models import Count
 
+from blog.category_feeds import FEED_LOOKUPS, feed_posts
+from blog.conditional import (
+    category_etag, index_etag, post_detail_etag, profile_etag
+)
 from blog.models import Post, Category, Comment
-from blog.constants import NUMBER_POSTS_PER_PAGE
+from blog.constants import (
+    CURSOR_PARAM,
+    DATE_PARAM,
+    NUMBER_COMMENTS_PER_PAGE,
+    NUMBER_POSTS_PER_PAGE,
+    PAGINATE_FEEDS_BY_CURSOR,
+)
+from blog.feed_counts import CachedCountPaginator, feed_count_key
 from blog.forms import CommentForm, PostForm, ProfileForm
+from blog.page_cache import (
+    INDEX_SCOPE, cache_page_for_anonymous, category_scope
+)
+from blog.paginators import KeysetPaginator
+from blog.search import search_posts
 
 
 def get_filtered_posts():
-    return Post.objects.filter(
-        is_published=True,
-        pub_date__lte=timezone.now(),
-        category__is_published=True
-    ).select_related('author', 'category')
+    return Post.objects.published().select_related('author', 'category')
 
 
-def get_paginator_posts(queryset, request, post_per_page):
-    paginator = Paginator(queryset, post_per_page)
+def use_keyset_pagination(request):
+    return (
+        PAGINATE_FEEDS_BY_CURSOR
+        or CURSOR_PARAM in request.GET
+        or DATE_PARAM in request.GET
+    )
+
+
+def get_keyset_page(queryset, request, post_per_page, lookups=None):
+    paginator = KeysetPaginator(queryset, post_per_page, lookups=lookups)
+    cursor = request.GET.get(CURSOR_PARAM)
+    try:
+        date = parse_date(request.GET.get(DATE_PARAM, ''))
+        next_day = date and date + timedelta(days=1)
+    except (ValueError, OverflowError):
+        # За последним днём календаря лента и так начинается с новейших.
+        next_day = None
+    if next_day and not cursor:
+        cursor = paginator.cursor_from_value(timezone.make_aware(
+            datetime.combine(next_day, time.min)
+        ))
+    return paginator.get_page(cursor)
+
+
+def get_paginator_posts(queryset, request, post_per_page, count_key=None,
+                        scheduled=None, lookups=None):
+    if use_keyset_pagination(request):
+        return get_keyset_page(queryset, request, post_per_page, lookups)
+    paginator = CachedCountPaginator(
+        queryset, post_per_page, count_key=count_key, scheduled=scheduled
+    )
     page_number = request.GET.get('page')
     return paginator.get_page(page_number)
 
 
-def annotate_comment_count(queryset):
-    return queryset.annotate(
-        comment_count=Count('comments')
-    )
+def get_paginator_comments(post, request):
+    return KeysetPaginator(
+        post.comments.select_related('author'),
+        NUMBER_COMMENTS_PER_PAGE,
+        field='created_at',
+        descending=False,
+    ).get_page(request.GET.get(CURSOR_PARAM))
 
 
+@cache_page_for_anonymous(INDEX_SCOPE, scheduled=Post.objects.all)
+@condition(etag_func=index_etag)
 def index(request):
-    posts = annotate_comment_count(
-        get_filtered_posts(
-
-        ).order_by('-pub_date'))
-    page_obj = get_paginator_posts(posts, request, NUMBER_POSTS_PER_PAGE)
+    posts = get_filtered_posts().order_by('-pub_date', '-id')
+    page_obj = get_paginator_posts(
+        posts, request, NUMBER_POSTS_PER_PAGE,
+        count_key=feed_count_key('index'),
+        scheduled=Post.objects.all(),
+    )
     return render(request, 'blog/index.html', {
         'page_obj': page_obj
     })
 
 
+def search(request):
+    query = request.GET.get('q', '').strip()
+    posts = search_posts(get_filtered_posts(), query)
+    page_obj = Paginator(posts, NUMBER_POSTS_PER_PAGE).get_page(
+        request.GET.get('page')
+    )
+    return render(request, 'blog/search.html', {
+        'query': query,
+        'page_obj': page_obj,
+    })
+
+
+@condition(etag_func=post_detail_etag)
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
-    filtered_posts = get_filtered_posts()
-    if post not in filtered_posts and post.author != request.user:
-        raise Http404("Post not found")
-    comments = post.comments.all().order_by('created_at')
+    post = get_object_or_404(
+        Post.objects.visible_to(request.user).select_related(
+            'author', 'category', 'location'
+        ),
+        id=post_id,
+    )
     form = CommentForm()
     return render(request, 'blog/detail.html', {
         'post': post,
-        'comments': comments,
+        'comments': get_paginator_comments(post, request),
         'form': form,
     })
 
 
+def post_comments(request, post_id):
+    post = get_object_or_404(
+        Post.objects.visible_to(request.user).only('id'),
+        id=post_id,
+    )
+    return render(request, 'includes/comment_list.html', {
+        'post': post,
+        'comments': get_paginator_comments(post, request),
+    })
+
+
+def get_category_scheduled(category_slug):
+    return Post.objects.filter(category__slug=category_slug)
+
+
+@cache_page_for_anonymous(category_scope, scheduled=get_category_scheduled)
+@condition(etag_func=category_etag)
 def category_posts(request, category_slug):
     category = get_object_or_404(
         Category,
         slug=category_slug,
         is_published=True,
     )
-    posts = annotate_comment_count(
-        get_filtered_posts().filter(category=category)
-    ).order_by('-pub_date')
-    page_obj = get_paginator_posts(posts, request, NUMBER_POSTS_PER_PAGE)
+    posts = feed_posts(category).select_related(
+        'author', 'category'
+    ).order_by(*(f'-{lookup}' for lookup in FEED_LOOKUPS))
+    page_obj = get_paginator_posts(
+        posts, request, NUMBER_POSTS_PER_PAGE,
+        count_key=feed_count_key('category', category.id),
+        scheduled=Post.objects.filter(category=category),
+        lookups=FEED_LOOKUPS,
+    )
     return render(request, 'blog/category.html', {
         'category': category,
         'page_obj': page_obj,
@@ -131,7 +217,7 @@ def add_comment(request, post_id):
         new_comment.author = request.user
         new_comment.save()
         return redirect('blog:post_detail', post_id=post_id)
-    comments = post.comments.all()
+    comments = post.comments.select_related('author')
     return render(request, 'blog/create.html', {
         'form': form,
         'post': post,
@@ -178,6 +264,7 @@ def delete_comment(request, post_id, comment_id):
     })
 
 
+@method_decorator(condition(etag_func=profile_etag), name='get')
 class UserProfileViews(SingleObjectMixin, ListView):
     template_name = 'blog/profile.html'
     paginate_by = NUMBER_POSTS_PER_PAGE
@@ -195,12 +282,30 @@ class UserProfileViews(SingleObjectMixin, ListView):
         return context
 
     def get_queryset(self):
-        posts = Post.objects.filter(
+        posts = Post.objects.visible_to(self.request.user).filter(
             author=self.object,
-        ).order_by('-pub_date')
-        posts = annotate_comment_count(posts)
+        ).select_related('author', 'category').order_by('-pub_date', '-id')
         return posts
 
+    def get_paginator(self, queryset, per_page, **kwargs):
+        if self.request.user == self.object:
+            scope, scheduled = 'all', None
+        else:
+            scope = 'public'
+            scheduled = Post.objects.filter(author=self.object)
+        return CachedCountPaginator(
+            queryset, per_page,
+            count_key=feed_count_key('author', self.object.id, scope),
+            scheduled=scheduled,
+            **kwargs,
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if not use_keyset_pagination(self.request):
+            return super().paginate_queryset(queryset, page_size)
+        page = get_keyset_page(queryset, self.request, page_size)
+        return None, page, page.object_list, page.has_other_pages()
+
 
 class EditProfileView(LoginRequiredMixin, UpdateView):
     model = User
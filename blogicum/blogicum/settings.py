@@ -83,6 +83,21 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+# Кэш страниц, счётчики лент и поколения должны быть общими для всех
+# процессов сервера, обработчика изображений и команд управления, поэтому
+# кэш хранится в файлах, а не в памяти процесса. На нескольких серверах
+# его заменяют на Memcached или Redis.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -136,5 +151,15 @@ LOGIN_URL = 'login'
 
 MEDIA_ROOT = BASE_DIR / 'media'
 
+MEDIA_URL = '/media/'
+
+# Внутренний путь прокси (например, location с internal в nginx), которому
+# передаётся отдача медиафайлов заголовком X-Accel-Redirect. None — файлы
+# отдаёт само приложение.
+MEDIA_ACCEL_REDIRECT_PREFIX = None
+
+# Каталог, где хранятся сгенерированные файлы карты сайта.
+SITEMAP_CACHE_DIR = BASE_DIR / 'sitemaps'
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
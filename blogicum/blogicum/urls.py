@@ -1,8 +1,11 @@
+from django.conf import settings
 from django.contrib import admin
 from django.contrib.auth.forms import UserCreationForm
 from django.urls import include, path, reverse_lazy
 from django.views.generic import CreateView
 
+from blog.media import serve_media
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('auth/', include('django.contrib.auth.urls')),
@@ -16,6 +19,11 @@ urlpatterns = [
         name='registration'
     ),
     path('pages/', include('pages.urls')),
+    path(
+        f"{settings.MEDIA_URL.lstrip('/')}<path:path>",
+        serve_media,
+        name='media',
+    ),
     path('', include('blog.urls')),
 ]
 
@@ -1,11 +1,16 @@
 from django.shortcuts import render
+from django.utils.decorators import method_decorator
 from django.views.generic import TemplateView
 
+from blog.page_cache import STATIC_SCOPE, cache_page_for_anonymous
 
+
+@method_decorator(cache_page_for_anonymous(STATIC_SCOPE), name='dispatch')
 class About(TemplateView):
     template_name = 'pages/about.html'
 
 
+@method_decorator(cache_page_for_anonymous(STATIC_SCOPE), name='dispatch')
 class Rules(TemplateView):
     template_name = 'pages/rules.html'
 
@@ -3,6 +3,7 @@ import re
 import time
 from http import HTTPStatus
 from inspect import getsource
+from io import BytesIO
 from pathlib import Path
 from typing import (
     Iterable,
@@ -19,13 +20,17 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.images import ImageFile
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
 from django.test import override_settings
 from django.test.client import Client
 from mixer.backend.django import mixer as _mixer
+from PIL import Image as PILImage
 
+EXIF_ORIENTATION = 0x0112
 N_PER_FIXTURE = 3
 N_PER_PAGE = 10
 COMMENT_TEXT_DISPLAY_LEN_FOR_TESTS = 50
@@ -41,6 +46,34 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_cache(settings, tmp_path_factory):
+    settings.CACHES = {
+        "default": {
+            **settings.CACHES["default"],
+            "LOCATION": tmp_path_factory.mktemp("cache"),
+        }
+    }
+    cache.clear()
+    yield
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def photo_file(name="photo.jpg"):
+    """JPEG 2000×1000, повёрнутый тегом EXIF Orientation на 90°."""
+    image = PILImage.new("RGB", (2000, 1000), color=(73, 109, 137))
+    exif = PILImage.Exif()
+    exif[EXIF_ORIENTATION] = 6
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", exif=exif)
+    return ImageFile(buffer, name=name)
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -0,0 +1,155 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+from blog.paginators import estimate_row_count
+
+pytestmark = [pytest.mark.django_db]
+
+CHANGELIST_URL = "/admin/blog/post/"
+FULL_TEXT_COLUMN = re.compile(r'(?<!SUBSTR\()"blog_post"\."text"')
+
+
+def _changelist_queries(admin_client, params=None):
+    with CaptureQueriesContext(connection) as context:
+        response = admin_client.get(CHANGELIST_URL, params or {})
+    assert response.status_code == 200
+    return response, [query["sql"] for query in context.captured_queries]
+
+
+def test_post_changelist_queries(admin_client, mixer, published_category):
+    mixer.cycle(30).blend(
+        "blog.Post", category=published_category, text="Слово " * 1000
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+    response, first = _changelist_queries(admin_client)
+    assert not any("COUNT(" in sql for sql in first), (
+        "Убедитесь, что список публикаций в админке не считает все строки"
+        " таблицы."
+    )
+    assert not any(FULL_TEXT_COLUMN.search(sql) for sql in first), (
+        "Убедитесь, что список публикаций в админке не загружает полные"
+        " тексты."
+    )
+    assert len(response.context["cl"].result_list) == 7
+
+    _, second = _changelist_queries(admin_client)
+    assert len(second) < len(first), (
+        "Убедитесь, что разбивка по датам в админке берётся из кэша."
+    )
+
+    mixer.cycle(30).blend("blog.Post", category=published_category)
+    _, third = _changelist_queries(admin_client)
+    assert len(third) == len(second), (
+        "Убедитесь, что число запросов списка публикаций не зависит от"
+        " числа публикаций."
+    )
+
+
+def test_post_changelist_pages_past_stale_estimate(
+        admin_client, mixer, published_category
+):
+    mixer.cycle(30).blend("blog.Post", category=published_category)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    mixer.cycle(30).blend("blog.Post", category=published_category)
+
+    response, _ = _changelist_queries(admin_client, {"p": 9})
+    assert len(response.context["cl"].result_list) == 60 - 8 * 7, (
+        "Убедитесь, что устаревшая оценка числа строк не закрывает"
+        " последние страницы списка публикаций."
+    )
+    response = admin_client.get(CHANGELIST_URL, {"p": 10})
+    assert response.status_code == 302
+
+
+def test_estimate_ignores_partial_indexes(mixer, published_category):
+    mixer.cycle(20).blend(
+        "blog.Post", category=published_category, is_published=True
+    )
+    mixer.cycle(10).blend(
+        "blog.Post", category=published_category, is_published=False
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+        # Порядок строк статистики зависит от схемы: частичные индексы,
+        # где 20 строк, ставятся первыми.
+        cursor.execute(
+            "CREATE TEMP TABLE stat AS SELECT * FROM sqlite_stat1"
+        )
+        cursor.execute("DELETE FROM sqlite_stat1")
+        cursor.execute(
+            "INSERT INTO sqlite_stat1 SELECT * FROM stat ORDER BY stat"
+        )
+    assert estimate_row_count(Post) == 30, (
+        "Убедитесь, что оценка числа строк берётся по всей таблице, а не"
+        " по частичному индексу."
+    )
+
+
+def test_post_changelist_filtered_count(admin_client, mixer, user):
+    mixer.cycle(3).blend("blog.Post", author=user)
+    mixer.cycle(2).blend("blog.Post")
+    response, _ = _changelist_queries(
+        admin_client, {"author__id__exact": user.id}
+    )
+    assert response.context["cl"].result_count == 3
+
+
+@pytest.mark.parametrize("model, field", [
+    ("category", "category"), ("location", "location")
+])
+def test_related_change_form_links_to_posts(
+        admin_client, mixer, published_category, published_location,
+        model, field
+):
+    obj = {"category": published_category, "location": published_location}[
+        model
+    ]
+    mixer.cycle(50).blend("blog.Post", **{field: obj})
+    with CaptureQueriesContext(connection) as context:
+        response = admin_client.get(f"/admin/blog/{model}/{obj.id}/change/")
+    assert response.status_code == 200
+    content = response.content.decode("utf-8")
+    assert f"/admin/blog/post/?{field}__id__exact={obj.id}" in content, (
+        "Убедитесь, что форма категории и местоположения ссылается на"
+        " отфильтрованный список публикаций."
+    )
+    assert not any(
+        FULL_TEXT_COLUMN.search(query["sql"])
+        for query in context.captured_queries
+    ), (
+        "Убедитесь, что форма категории и местоположения не загружает"
+        " публикации целиком."
+    )
+    assert '>50</a>' in content
+
+
+@pytest.mark.parametrize("model, field", [
+    ("category", "category"), ("location", "location")
+])
+def test_related_changelist_counts_page_posts(
+        admin_client, mixer, model, field
+):
+    objects = mixer.cycle(3).blend(f"blog.{model.title()}")
+    for number, obj in enumerate(objects):
+        mixer.cycle(number).blend("blog.Post", **{field: obj})
+    with CaptureQueriesContext(connection) as context:
+        response = admin_client.get(f"/admin/blog/{model}/")
+    assert response.status_code == 200
+    post_queries = [
+        query["sql"] for query in context.captured_queries
+        if '"blog_post"' in query["sql"]
+    ]
+    assert len(post_queries) == 1 and " IN (" in post_queries[0], (
+        "Убедитесь, что список категорий и местоположений считает"
+        " публикации одним запросом только для строк страницы."
+    )
+    content = response.content.decode("utf-8")
+    for number, obj in enumerate(objects):
+        assert f"{field}__id__exact={obj.id}\">{number}</a>" in content
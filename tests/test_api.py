@@ -0,0 +1,88 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _json(client, url, params=None):
+    response = client.get(url, params or {})
+    assert response.status_code == 200
+    assert response.streaming, (
+        "Убедитесь, что JSON API отдаёт ответ потоком."
+    )
+    assert response["Content-Type"] == "application/json"
+    return json.loads(b"".join(response.streaming_content))
+
+
+def test_api_posts_cursor_walk(
+        client, mixer, user, published_category, published_location
+):
+    now = timezone.now()
+    posts = [
+        mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            location=published_location, is_published=True,
+            pub_date=now - timedelta(hours=hours),
+        )
+        for hours in range(1, 6)
+    ]
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False,
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=now + timedelta(days=1),
+    )
+
+    ids, url, params = [], "/api/posts/", {"per_page": 2}
+    while url:
+        data = _json(client, url, params)
+        ids += [row["id"] for row in data["results"]]
+        url, params = data["next"], None
+    assert ids == [post.id for post in posts], (
+        "Убедитесь, что JSON API листает только опубликованные записи"
+        " курсором от новых к старым."
+    )
+    row = _json(client, "/api/posts/", {"author": user.username})["results"][0]
+    assert row["author"] == user.username
+    assert row["category"] == published_category.slug
+    assert row["location"] == published_location.name
+
+
+def test_api_post_detail_with_comments(
+        client, user_client, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+    comments = mixer.cycle(3).blend("blog.Comment", post=post)
+    data = _json(client, f"/api/posts/{post.id}/")
+    assert data["title"] == post.title
+    assert [row["id"] for row in data["comments"]] == [
+        comment.id for comment in comments
+    ]
+
+    post.is_published = False
+    post.save()
+    assert client.get(f"/api/posts/{post.id}/").status_code == 404, (
+        "Убедитесь, что JSON API не показывает скрытые публикации чужим."
+    )
+    assert _json(user_client, f"/api/posts/{post.id}/")["id"] == post.id
+
+
+def test_api_categories_and_locations(
+        client, published_category, published_location, mixer
+):
+    mixer.blend("blog.Category", is_published=False)
+    mixer.blend("blog.Location", is_published=False)
+    assert [
+        row["slug"] for row in _json(client, "/api/categories/")["results"]
+    ] == [published_category.slug]
+    assert [
+        row["name"] for row in _json(client, "/api/locations/")["results"]
+    ] == [published_location.name]
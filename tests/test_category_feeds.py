@@ -0,0 +1,76 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+from blog.category_feeds import extra_entries, missing_posts
+from blog.models import CategoryFeedEntry, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _feed_ids(category):
+    return set(
+        CategoryFeedEntry.objects.filter(
+            category=category
+        ).values_list("post_id", flat=True)
+    )
+
+
+def test_feed_follows_post_and_category_changes(
+        mixer, published_category, another_category
+):
+    post = mixer.blend(
+        "blog.Post", category=published_category, is_published=True
+    )
+    assert _feed_ids(published_category) == {post.id}
+
+    post.category = another_category
+    post.save()
+    assert _feed_ids(published_category) == set()
+    assert _feed_ids(another_category) == {post.id}
+
+    another_category.is_published = False
+    another_category.save()
+    assert _feed_ids(another_category) == set()
+    another_category.is_published = True
+    another_category.save()
+    assert _feed_ids(another_category) == {post.id}
+
+    post.is_published = False
+    post.save()
+    assert _feed_ids(another_category) == set()
+    assert not missing_posts().exists()
+    assert not extra_entries().exists()
+
+
+def test_check_and_rebuild_commands(mixer, published_category):
+    posts = mixer.cycle(3).blend(
+        "blog.Post", category=published_category, is_published=True
+    )
+    Post.objects.filter(pk=posts[0].pk).update(is_published=False)
+    CategoryFeedEntry.objects.filter(post=posts[1]).delete()
+    assert list(missing_posts().values_list("id", flat=True)) == [
+        posts[1].id
+    ]
+    assert list(extra_entries().values_list("post_id", flat=True)) == [
+        posts[0].id
+    ]
+    with pytest.raises(CommandError):
+        call_command("check_category_feeds")
+
+    call_command("rebuild_category_feeds", published_category.slug)
+    assert _feed_ids(published_category) == {posts[1].id, posts[2].id}
+    call_command("check_category_feeds")
+
+
+def test_fix_inconsistencies(mixer, published_category):
+    post = mixer.blend(
+        "blog.Post", category=published_category, is_published=True
+    )
+    CategoryFeedEntry.objects.all().delete()
+    hidden = mixer.blend(
+        "blog.Post", category=published_category, is_published=True
+    )
+    Post.objects.filter(pk=hidden.pk).update(is_published=False)
+    call_command("check_category_feeds", fix=True)
+    assert _feed_ids(published_category) == {post.id}
+    call_command("check_category_feeds")
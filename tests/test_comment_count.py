@@ -0,0 +1,74 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _stored_count(post):
+    return Post.objects.values_list("comment_count", flat=True).get(
+        pk=post.pk
+    )
+
+
+def test_comment_count_follows_comments(
+        mixer, user_client, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.post(f"/posts/{post.id}/comment/", {"text": "Первый"})
+    mixer.cycle(2).blend(Comment, post=post, author=another_user)
+    assert _stored_count(post) == 3, (
+        "Убедитесь, что количество комментариев у публикации растёт при"
+        " добавлении комментария."
+    )
+
+    comment = Comment.objects.filter(post=post).exclude(
+        author=another_user
+    ).get()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    assert _stored_count(post) == 2
+
+    another_user.delete()
+    assert _stored_count(post) == 0, (
+        "Убедитесь, что количество комментариев уменьшается при каскадном"
+        " удалении комментариев."
+    )
+
+
+def test_recount_comments_command(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(4).blend(Comment, post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=42)
+    call_command("recount_comments", batch_size=1)
+    assert _stored_count(post) == 4
+
+
+def _bulk_comments(post, author, count):
+    Comment.objects.bulk_create(
+        Comment(post=post, author=author, text="Комментарий")
+        for _ in range(count)
+    )
+    Post.objects.filter(pk=post.pk).recount_comments()
+
+
+@pytest.mark.parametrize("comments", [5, 100])
+def test_cascade_delete_query_budget(
+        mixer, user, another_user, published_category, comments,
+        django_assert_max_num_queries,
+):
+    doomed, kept = mixer.cycle(2).blend(
+        Post, author=user, category=published_category, is_published=True
+    )
+    _bulk_comments(doomed, another_user, comments)
+    _bulk_comments(kept, another_user, comments)
+    _bulk_comments(kept, user, 2)
+
+    with django_assert_max_num_queries(10):
+        doomed.delete()
+    with django_assert_max_num_queries(15):
+        another_user.delete()
+    assert _stored_count(kept) == 2, (
+        "Убедитесь, что при удалении пользователя количество комментариев"
+        " пересчитывается один раз на публикацию, а не на комментарий."
+    )
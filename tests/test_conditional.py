@@ -0,0 +1,117 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+User = get_user_model()
+
+
+def _revalidate(client, url):
+    etag = client.get(url)["ETag"]
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    return response, [query["sql"] for query in context.captured_queries]
+
+
+@pytest.mark.parametrize("url", [
+    "/", "/category/{slug}/", "/profile/{user}/", "/posts/{post}/",
+])
+@pytest.mark.parametrize("client_fixture", ["client", "user_client"])
+def test_unchanged_page_not_modified(
+        request, client_fixture, user, published_category,
+        post_with_published_location, url
+):
+    client = request.getfixturevalue(client_fixture)
+    url = url.format(
+        slug=published_category.slug, user=user.username,
+        post=post_with_published_location.id,
+    )
+    response, queries = _revalidate(client, url)
+    assert response.status_code == 304, (
+        "Убедитесь, что неизменившаяся страница отдаётся с ответом 304."
+    )
+    assert not response.content
+    assert not any('"blog_post"."text"' in sql for sql in queries), (
+        "Убедитесь, что для ответа 304 публикации страницы не запрашиваются."
+    )
+
+
+@pytest.mark.parametrize("url", ["/", "/profile/{user}/", "/posts/{post}/"])
+def test_new_comment_changes_etag(
+        user_client, mixer, user, post_with_published_location, url
+):
+    post = post_with_published_location
+    url = url.format(user=user.username, post=post.id)
+    etag = user_client.get(url)["ETag"]
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    assert user_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+        "Убедитесь, что после нового комментария страница перерисовывается."
+    )
+    if "posts" in url:
+        etag = user_client.get(url)["ETag"]
+        comment.text = "Исправленный текст"
+        comment.save()
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+
+
+def test_etag_differs_between_users(
+        client, user_client, post_with_published_location
+):
+    assert client.get("/")["ETag"] != user_client.get("/")["ETag"]
+
+
+@pytest.mark.parametrize("url", [
+    "/", "/category/{slug}/", "/profile/{user}/", "/posts/{post}/",
+])
+def test_change_without_signals_changes_etag(
+        user_client, user, published_category, post_with_published_location,
+        url
+):
+    # Анонимам ETag отдаётся вместе со страницей из кэша и устаревает с
+    # ней; вошедшим пользователям кэш не отдаёт страниц.
+    post = post_with_published_location
+    url = url.format(
+        slug=published_category.slug, user=user.username, post=post.id
+    )
+    etag = user_client.get(url)["ETag"]
+    # Как правка из другого процесса: поколения кэша не сдвигаются.
+    Post.objects.filter(pk=post.pk).update(title="Новый заголовок")
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что ETag зависит от времени изменения строк в базе, а"
+        " не только от поколений кэша."
+    )
+
+
+def test_author_rename_changes_detail_etag(
+        client, user, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    etag = client.get(url)["ETag"]
+    User.objects.filter(pk=user.pk).update(username="renamed")
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+        "Убедитесь, что смена имени автора меняет ETag страницы публикации."
+    )
+
+
+@pytest.mark.parametrize("url", [
+    "/", "/category/{slug}/", "/feeds/rss/", "/feeds/category/{slug}/rss/",
+])
+def test_cached_page_revalidates_without_queries(
+        client, published_category, post_with_published_location, url
+):
+    url = url.format(slug=published_category.slug)
+    etag = client.get(url)["ETag"]
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert client.get(url)["X-Page-Cache"] == "HIT"
+    assert response.status_code == 304
+    assert not context.captured_queries, (
+        "Убедитесь, что страница из кэша проверяется по сохранённым с ней"
+        " ETag и Last-Modified, без запросов к базе."
+    )
@@ -0,0 +1,35 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _count_detail_queries(client, post):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(f"/posts/{post.id}/")
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+@pytest.mark.parametrize(
+    "client_fixture", ["user_client", "another_user_client", "client"]
+)
+def test_detail_query_budget_does_not_grow_with_comments(
+        request, mixer, post_with_published_location, client_fixture
+):
+    client = request.getfixturevalue(client_fixture)
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    few_comments = _count_detail_queries(client, post)
+
+    mixer.cycle(30).blend("blog.Comment", post=post)
+    many_comments = _count_detail_queries(client, post)
+
+    assert many_comments == few_comments, (
+        "Убедитесь, что число запросов к базе данных на странице публикации"
+        " не зависит от количества комментариев."
+    )
+    # Сессия, пользователь, проверка видимости для ETag, публикация и
+    # страница комментариев.
+    assert many_comments <= 5
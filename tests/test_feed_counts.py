@@ -0,0 +1,54 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.feed_counts import feed_count_key
+from blog.views import get_filtered_posts
+
+pytestmark = [pytest.mark.django_db]
+
+INDEX_KEY = feed_count_key("index")
+
+
+def test_index_count_is_served_from_cache(
+        user_client, many_posts_with_published_locations
+):
+    user_client.get("/")
+    with CaptureQueriesContext(connection) as context:
+        response = user_client.get("/", {"page": 2})
+    assert response.context["page_obj"].paginator.count == (
+        get_filtered_posts().count()
+    )
+    assert not any(
+        "COUNT(" in query["sql"] for query in context.captured_queries
+    ), "Убедитесь, что число публикаций в ленте берётся из кэша."
+
+
+def test_counts_follow_post_changes(
+        mixer, user, user_client, published_category,
+        many_posts_with_published_locations
+):
+    category_key = feed_count_key("category", published_category.id)
+    user_client.get("/")
+    user_client.get(f"/category/{published_category.slug}/")
+    expected = get_filtered_posts().count()
+    assert cache.get(INDEX_KEY) == expected
+
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+    )
+    assert cache.get(INDEX_KEY) == cache.get(category_key) == expected + 1
+
+    post.is_published = False
+    post.save()
+    assert cache.get(INDEX_KEY) == cache.get(category_key) == expected
+
+    many_posts_with_published_locations[0].delete()
+    assert cache.get(INDEX_KEY) == expected - 1
+
+    published_category.is_published = False
+    published_category.save()
+    assert cache.get(INDEX_KEY) is None
+    assert cache.get(category_key) is None
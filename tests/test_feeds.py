@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from django.utils.http import http_date
+
+pytestmark = [pytest.mark.django_db]
+
+FEED_URLS = [
+    "/feeds/{kind}/",
+    "/feeds/category/{slug}/{kind}/",
+    "/feeds/profile/{user}/{kind}/",
+]
+
+
+@pytest.fixture
+def feed_posts(mixer, user, published_category):
+    now = timezone.now()
+    visible = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=now - timedelta(days=1),
+        title="Видимая публикация",
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False, title="Скрытая публикация",
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=now + timedelta(days=1),
+        title="Отложенная публикация",
+    )
+    return visible
+
+
+@pytest.mark.parametrize("url", FEED_URLS)
+@pytest.mark.parametrize("kind, content_type", [
+    ("rss", "application/rss+xml"), ("atom", "application/atom+xml"),
+])
+def test_feeds_show_only_published_posts(
+        client, user, published_category, feed_posts, url, kind,
+        content_type
+):
+    url = url.format(kind=kind, slug=published_category.slug, user=user)
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith(content_type)
+    content = response.content.decode("utf-8")
+    assert "Видимая публикация" in content
+    assert "Скрытая публикация" not in content, (
+        "Убедитесь, что в ленты попадают только опубликованные записи."
+    )
+    assert "Отложенная публикация" not in content
+
+
+@pytest.mark.parametrize("url", FEED_URLS)
+def test_feeds_conditional_get(
+        client, mixer, user, published_category, feed_posts, url
+):
+    url = url.format(kind="atom", slug=published_category.slug, user=user)
+    response = client.get(url)
+    etag, last_modified = response["ETag"], response["Last-Modified"]
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304, (
+        "Убедитесь, что неизменившаяся лента отдаётся с ответом 304."
+    )
+    assert client.get(
+        url, HTTP_IF_MODIFIED_SINCE=last_modified
+    ).status_code == 304
+    assert client.get(url)["X-Page-Cache"] == "HIT"
+
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(hours=1),
+    )
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+    assert client.get(
+        url, HTTP_IF_MODIFIED_SINCE=http_date(
+            (timezone.now() - timedelta(minutes=1)).timestamp()
+        )
+    ).status_code == 200
+
+
+def test_unknown_feed_object_not_found(client):
+    assert client.get("/feeds/category/missing/rss/").status_code == 404
+    assert client.get("/feeds/profile/missing/rss/").status_code == 404
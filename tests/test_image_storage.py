@@ -0,0 +1,79 @@
+import os
+import time
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Post
+from blog.renditions import has_renditions, rendition_name
+from blog.storage import post_image_storage
+from conftest import photo_file
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _collect(*args):
+    out = StringIO()
+    call_command("collect_orphan_images", "--grace", "0", *args, stdout=out)
+    return out.getvalue()
+
+
+def test_identical_uploads_share_file(mixer, media_root):
+    first, second = (
+        mixer.blend("blog.Post", image=photo_file(name))
+        for name in ("a.JPG", "b.jpg")
+    )
+    assert first.image.name == second.image.name, (
+        "Убедитесь, что одинаковые изображения хранятся в одном файле."
+    )
+    assert first.image.name.endswith(".jpg")
+    assert len(list(media_root.rglob("*.jpg"))) == 1
+
+
+def test_orphans_collected(mixer, media_root):
+    kept, replaced = (
+        mixer.blend("blog.Post", image=photo_file()) for _ in range(2)
+    )
+    call_command("process_image_jobs", "--once", processes=1)
+    name = kept.image.name
+
+    kept.delete()
+    assert "Удалено файлов: 0" in _collect(), (
+        "Убедитесь, что файл, на который ссылается другая публикация, не"
+        " удаляется."
+    )
+    assert has_renditions(name)
+
+    replaced.image = None
+    replaced.save()
+    assert "Будет удалено файлов: 4" in _collect("--dry-run")
+    assert has_renditions(name)
+    _collect()
+    assert not list(media_root.rglob("*.jpg")), (
+        "Убедитесь, что collect_orphan_images удаляет изображения без"
+        " публикаций вместе с их копиями."
+    )
+    assert not Post.objects.exclude(image="").exclude(image=None).exists()
+    assert rendition_name(name, 320).startswith("post_images/")
+
+
+def test_reuploaded_orphan_survives_collection(mixer, media_root):
+    post = mixer.blend("blog.Post", image=photo_file())
+    call_command("process_image_jobs", "--once", processes=1)
+    name = post.image.name
+    post.image = None
+    post.save()
+    old = time.time() - 2 * 60 * 60
+    for path in media_root.rglob("*.jpg"):
+        os.utime(path, (old, old))
+
+    # Та же картинка загружена для публикации, которая ещё не сохранена.
+    assert post_image_storage.save("post_images/c.jpg", photo_file()) == name
+    out = StringIO()
+    call_command("collect_orphan_images", stdout=out)
+    assert "Удалено файлов: 0" in out.getvalue(), (
+        "Убедитесь, что повторно загруженное изображение без ссылок не"
+        " удаляется до истечения срока."
+    )
+    assert post_image_storage.exists(name) and has_renditions(name)
@@ -0,0 +1,95 @@
+import pytest
+from django.core.management import call_command
+
+from blog.renditions import rendition_name
+from conftest import photo_file
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def image_post(mixer, media_root):
+    post = mixer.blend("blog.Post", image=photo_file())
+    with post.image.open("rb") as file:
+        post.image_bytes = file.read()
+    return post
+
+
+def _content(response):
+    return b"".join(response.streaming_content)
+
+
+def test_media_served_with_cache_headers(client, image_post):
+    url = image_post.image.url
+    assert url.startswith("/media/post_images/")
+    response = client.get(url)
+    assert response.status_code == 200
+    assert _content(response) == image_post.image_bytes
+    assert response["Content-Type"] == "image/jpeg"
+    assert response["Accept-Ranges"] == "bytes"
+    assert "immutable" in response["Cache-Control"], (
+        "Убедитесь, что файлы с именем по хэшу содержимого кэшируются как"
+        " неизменяемые."
+    )
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == 304, (
+        "Убедитесь, что медиафайл отдаётся с ответом 304, если не изменился."
+    )
+
+
+def test_renditions_not_immutable(client, image_post):
+    call_command("process_image_jobs", "--once", processes=1)
+    url = "/media/" + rendition_name(image_post.image.name, 320)
+    response = client.get(url)
+    assert response.status_code == 200
+    assert "immutable" not in response["Cache-Control"], (
+        "Убедитесь, что копии изображений не кэшируются как неизменяемые:"
+        " regenerate_renditions переписывает их под теми же именами."
+    )
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-9", slice(0, 10)),
+    ("bytes=10-", slice(10, None)),
+    ("bytes=-5", slice(-5, None)),
+])
+def test_media_range_requests(client, image_post, header, expected):
+    response = client.get(image_post.image.url, HTTP_RANGE=header)
+    assert response.status_code == 206
+    body = image_post.image_bytes[expected]
+    assert _content(response) == body
+    assert int(response["Content-Length"]) == len(body)
+
+
+def test_media_unsatisfiable_and_stale_ranges(client, image_post):
+    url = image_post.image.url
+    size = len(image_post.image_bytes)
+    response = client.get(url, HTTP_RANGE=f"bytes={size}-")
+    assert response.status_code == 416
+    assert response["Content-Range"] == f"bytes */{size}"
+
+    response = client.get(
+        url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"outdated"'
+    )
+    assert response.status_code == 200
+    assert _content(response) == image_post.image_bytes
+
+
+@pytest.mark.parametrize("path", [
+    "/media/other/file.jpg",
+    "/media/post_images/../../blogicum/settings.py",
+    "/media/post_images/missing.jpg",
+])
+def test_media_outside_post_images_not_found(client, media_root, path):
+    assert client.get(path).status_code == 404
+
+
+def test_media_accel_redirect(client, image_post, settings):
+    settings.MEDIA_ACCEL_REDIRECT_PREFIX = "/protected-media/"
+    response = client.get(image_post.image.url)
+    assert response.status_code == 200
+    assert response["X-Accel-Redirect"] == (
+        "/protected-media/" + image_post.image.name
+    )
+    assert response.content == b""
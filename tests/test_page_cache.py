@@ -0,0 +1,146 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from blog.page_cache import (
+    INDEX_SCOPE,
+    STATS_KEYS,
+    _generation_key,
+    get_generation,
+    get_stats,
+    timeout_before,
+)
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _cache_status(client, url):
+    return client.get(url).get("X-Page-Cache")
+
+
+@pytest.mark.parametrize("url", ["/", "/pages/about/", "/pages/rules/"])
+def test_anonymous_pages_are_cached(client, url):
+    assert _cache_status(client, url) == "MISS"
+    assert _cache_status(client, url) == "HIT", (
+        f"Убедитесь, что страница `{url}` кэшируется для анонимов."
+    )
+    assert get_stats() == {"hits": 1, "misses": 1}
+
+
+def test_logged_in_users_bypass_cache(user_client):
+    user_client.get("/")
+    assert _cache_status(user_client, "/") is None
+
+
+def test_post_and_comment_changes_invalidate_feeds(
+        client, mixer, post_with_published_location, published_category
+):
+    category_url = f"/category/{published_category.slug}/"
+    for url in ("/", category_url):
+        client.get(url)
+        assert _cache_status(client, url) == "HIT"
+
+    new_post = mixer.blend(
+        "blog.Post", category=published_category, is_published=True,
+        title="Свежая публикация",
+    )
+    for url in ("/", category_url):
+        response = client.get(url)
+        assert response["X-Page-Cache"] == "MISS"
+        assert new_post.title in response.content.decode("utf-8"), (
+            "Убедитесь, что кэш ленты сбрасывается при добавлении публикации."
+        )
+
+    mixer.blend("blog.Comment", post=new_post)
+    assert _cache_status(client, "/") == "MISS", (
+        "Убедитесь, что кэш ленты сбрасывается при добавлении комментария."
+    )
+
+
+def test_location_change_invalidates_everything(
+        client, post_with_published_location
+):
+    client.get("/")
+    location = post_with_published_location.location
+    location.name = "Новое место"
+    location.save()
+    assert "Новое место" in client.get("/").content.decode("utf-8")
+
+
+def test_page_cache_stats_command(client, capsys):
+    client.get("/")
+    client.get("/")
+    call_command("page_cache_stats", reset=True)
+    assert "50.0%" in capsys.readouterr().out
+    assert get_stats() == {"hits": 0, "misses": 0}
+
+
+def test_page_cache_is_shared_between_processes(
+        client, settings, post_with_published_location
+):
+    client.get("/")
+    # Отдельный экземпляр бэкенда, как в другом процессе.
+    other = FileBasedCache(settings.CACHES["default"]["LOCATION"], {})
+    assert other.get(STATS_KEYS[1]) == 1, (
+        "Убедитесь, что счётчики кэша страниц видны другим процессам."
+    )
+
+    post_with_published_location.title = "Новый заголовок"
+    post_with_published_location.save()
+    assert other.get(_generation_key(INDEX_SCOPE)) == get_generation(
+        INDEX_SCOPE
+    )
+
+
+def test_page_cache_stats_refuses_local_memory(settings):
+    settings.CACHES = {"default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }}
+    with pytest.raises(CommandError):
+        call_command("page_cache_stats")
+
+
+def test_cache_expires_with_next_scheduled_post(
+        client, mixer, monkeypatch, post_with_published_location,
+        published_category
+):
+    mixer.blend(
+        "blog.Post", category=published_category, is_published=True,
+        pub_date=timezone.now() + timedelta(minutes=30),
+    )
+    mixer.blend(
+        "blog.Post", category=published_category, is_published=False,
+        pub_date=timezone.now() + timedelta(minutes=5),
+    )
+    timeouts = {}
+    original_set = cache.set
+
+    def recording_set(key, value, timeout=None, version=None):
+        timeouts[key] = timeout
+        return original_set(key, value, timeout, version)
+
+    monkeypatch.setattr(cache, "set", recording_set)
+    client.get("/")
+    client.get(f"/category/{published_category.slug}/")
+    page_timeouts = [
+        timeout for key, timeout in timeouts.items()
+        if key.startswith("page_cache:page:")
+    ]
+    assert len(page_timeouts) == 2
+    for timeout in page_timeouts:
+        assert 29 * 60 < timeout <= 30 * 60 + 1, (
+            "Убедитесь, что кэш ленты истекает к ближайшей отложенной"
+            " публикации."
+        )
+
+
+def test_timeout_before():
+    now = timezone.now()
+    assert timeout_before(None, 100) == 100
+    assert timeout_before(now + timedelta(seconds=10), 100) <= 11
+    assert timeout_before(now + timedelta(days=1), 100) == 100
+    assert timeout_before(now - timedelta(seconds=10), 100) == 1
@@ -0,0 +1,148 @@
+from datetime import timedelta
+
+import pytest
+from django.test.client import Client
+from django.utils import timezone
+
+from blog.constants import NUMBER_COMMENTS_PER_PAGE
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _walk_cursor_pages(client: Client, url: str):
+    pages = []
+    response = client.get(url, {"cursor": ""})
+    while True:
+        assert response.status_code == 200, (
+            "Убедитесь, что страница ленты с курсором загружается без ошибок."
+        )
+        page_obj = response.context["page_obj"]
+        pages.append(page_obj)
+        if not page_obj.has_next():
+            return pages
+        response = client.get(url, {"cursor": page_obj.next_cursor})
+
+
+@pytest.mark.parametrize("url", ["/", "/category/{slug}/", "/profile/{user}/"])
+def test_cursor_pagination_walks_whole_feed(
+        user_client, user, published_category,
+        many_posts_with_published_locations, url
+):
+    url = url.format(slug=published_category.slug, user=user.username)
+    expected = [
+        post.id for post in sorted(
+            many_posts_with_published_locations,
+            key=lambda post: (post.pub_date, post.id),
+            reverse=True,
+        )
+    ]
+    pages = _walk_cursor_pages(user_client, url)
+    assert all(len(page) <= N_PER_PAGE for page in pages)
+    assert [post.id for page in pages for post in page] == expected, (
+        "Убедитесь, что при листании курсором публикации не теряются и не"
+        " повторяются."
+    )
+
+    last_page = pages[-1]
+    response = user_client.get(url, {"cursor": last_page.previous_cursor})
+    assert [post.id for post in response.context["page_obj"]] == [
+        post.id for post in pages[-2]
+    ], "Убедитесь, что курсор «назад» возвращает предыдущую страницу."
+
+
+def test_invalid_cursor_returns_first_page(
+        user_client, many_posts_with_published_locations
+):
+    response = user_client.get("/", {"cursor": "not-a-cursor"})
+    assert response.status_code == 200
+    assert len(response.context["page_obj"]) == N_PER_PAGE
+    assert not response.context["page_obj"].has_previous()
+
+
+def test_comments_fragment_pages(
+        user_client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(NUMBER_COMMENTS_PER_PAGE + 5).blend(
+        "blog.Comment", post=post
+    )
+    expected = [
+        comment.id for comment in sorted(
+            comments, key=lambda comment: (comment.created_at, comment.id)
+        )
+    ]
+
+    first_page = user_client.get(f"/posts/{post.id}/").context["comments"]
+    assert [c.id for c in first_page] == expected[:NUMBER_COMMENTS_PER_PAGE], (
+        "Убедитесь, что на странице публикации выводится первая порция"
+        " комментариев «от старых к новым»."
+    )
+    assert first_page.has_next()
+
+    response = user_client.get(
+        f"/posts/{post.id}/comments/", {"cursor": first_page.next_cursor}
+    )
+    assert response.status_code == 200
+    assert [c.id for c in response.context["comments"]] == (
+        expected[NUMBER_COMMENTS_PER_PAGE:]
+    ), "Убедитесь, что фрагмент отдаёт следующую порцию комментариев."
+    assert not response.context["comments"].has_next()
+
+
+def test_comments_fragment_respects_visibility(
+        another_user_client, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False,
+    )
+    response = another_user_client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == 404
+
+
+def test_page_links_are_windowed(user_client, mixer, published_category):
+    mixer.cycle(N_PER_PAGE * 30).blend(
+        "blog.Post", category=published_category, is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    content = user_client.get("/", {"page": 15}).content.decode("utf-8")
+    assert content.count('class="page-item') < 15, (
+        "Убедитесь, что пагинатор выводит ссылки только на ближайшие"
+        " страницы, а не на все страницы ленты."
+    )
+    assert "?page=30" in content and "?page=16" in content
+
+
+def test_jump_to_date(user_client, mixer, published_category):
+    now = timezone.now()
+    posts = [
+        mixer.blend(
+            "blog.Post", category=published_category, is_published=True,
+            pub_date=now - timedelta(days=days),
+        )
+        for days in range(1, N_PER_PAGE * 2)
+    ]
+    target = (now - timedelta(days=5)).date()
+    page_obj = user_client.get(
+        "/", {"date": target.isoformat()}
+    ).context["page_obj"]
+    assert [post.id for post in page_obj] == [
+        post.id for post in posts
+        if timezone.localdate(post.pub_date) <= target
+    ][:N_PER_PAGE], (
+        "Убедитесь, что переход к дате открывает ленту с публикаций,"
+        " сделанных не позже выбранного дня."
+    )
+    for url in ("/", f"/category/{published_category.slug}/"):
+        response = user_client.get(url, {"date": "9999-12-31"})
+        assert response.status_code == 200, (
+            "Убедитесь, что переход к последнему дню календаря не ломает"
+            " ленту."
+        )
+        assert [post.id for post in response.context["page_obj"]] == [
+            post.id for post in posts
+        ][:N_PER_PAGE]
+    assert user_client.get(
+        f"/profile/{posts[0].author.username}/", {"date": "9999-12-31"}
+    ).status_code == 200
@@ -0,0 +1,137 @@
+import re
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.category_feeds import FEED_LOOKUPS, feed_posts
+from blog.conditional import feed_last_modified
+from blog.models import Comment, Post
+from blog.paginators import KeysetPaginator
+from blog.views import get_filtered_posts
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite",
+        reason="Планы запросов проверяются для SQLite.",
+    ),
+]
+
+TABLE_SCAN = re.compile(r"\bSCAN (TABLE )?(?P<table>\w+)\b(?! USING)")
+
+
+def _scanned_tables(plan):
+    return [
+        match.group("table") for match in TABLE_SCAN.finditer(plan)
+        if match.group("table").startswith("blog_")
+    ]
+
+
+@pytest.mark.parametrize("plan, tables", [
+    ("SCAN blog_post", ["blog_post"]),
+    ("SCAN TABLE blog_post", ["blog_post"]),
+    ("SCAN blog_post USING INDEX post_pub_date_idx", []),
+    ("SCAN TABLE blog_post USING COVERING INDEX post_pub_date_idx", []),
+    ("SEARCH blog_post USING INDEX post_pub_date_idx (pub_date<?)", []),
+])
+def test_table_scan_pattern(plan, tables):
+    assert _scanned_tables(plan) == tables
+
+
+def assert_plan_uses_indexes(queryset, description):
+    plan = queryset.explain()
+    scans = _scanned_tables(plan)
+    assert not scans, (
+        f"Убедитесь, что {description} не читает таблицы {scans} целиком."
+        f" План запроса:\n{plan}"
+    )
+    assert "TEMP B-TREE" not in plan, (
+        f"Убедитесь, что {description} не сортирует строки во временном"
+        f" B-дереве. План запроса:\n{plan}"
+    )
+
+
+def test_index_feed_plan():
+    assert_plan_uses_indexes(
+        get_filtered_posts().order_by("-pub_date", "-id")[:10],
+        "лента главной страницы",
+    )
+
+
+def test_index_feed_cursor_plan():
+    paginator = KeysetPaginator(get_filtered_posts(), 10)
+    queryset = get_filtered_posts().filter(
+        paginator._after(timezone.now(), 1)
+    ).order_by(*paginator._ordering())[:11]
+    assert_plan_uses_indexes(queryset, "страница ленты по курсору")
+
+
+def test_category_feed_plan(published_category):
+    assert_plan_uses_indexes(
+        feed_posts(published_category).select_related(
+            "author", "category"
+        ).order_by(*(f"-{lookup}" for lookup in FEED_LOOKUPS))[:10],
+        "лента категории",
+    )
+
+
+def test_category_feed_cursor_plan(published_category):
+    paginator = KeysetPaginator(
+        feed_posts(published_category), 10, lookups=FEED_LOOKUPS
+    )
+    queryset = paginator.object_list.filter(
+        paginator._after(timezone.now(), 1)
+    ).order_by(*paginator._ordering())[:11]
+    assert_plan_uses_indexes(queryset, "страница ленты категории по курсору")
+
+
+@pytest.mark.parametrize("owner", [True, False], ids=["owner", "visitor"])
+def test_profile_feed_plan(user, owner):
+    viewer = user if owner else AnonymousUser()
+    assert_plan_uses_indexes(
+        Post.objects.visible_to(viewer).filter(
+            author=user
+        ).order_by("-pub_date", "-id")[:10],
+        "лента профиля",
+    )
+
+
+def test_post_comments_plan(post_with_published_location):
+    assert_plan_uses_indexes(
+        Comment.objects.filter(
+            post=post_with_published_location
+        ).order_by("created_at", "id")[:10],
+        "список комментариев",
+    )
+
+
+def test_post_comments_cursor_plan(post_with_published_location):
+    paginator = KeysetPaginator(
+        post_with_published_location.comments.all(), 10,
+        field="created_at", descending=False,
+    )
+    queryset = paginator.object_list.filter(
+        paginator._after(timezone.now(), 1)
+    ).order_by(*paginator._ordering())[:11]
+    assert_plan_uses_indexes(queryset, "порция комментариев по курсору")
+
+
+@pytest.mark.parametrize("lookup", ["category__slug", "author__username"])
+def test_feed_last_modified_plan(user, published_category, lookup):
+    value = {
+        "category__slug": published_category.slug,
+        "author__username": user.username,
+    }[lookup]
+    with CaptureQueriesContext(connection) as context:
+        feed_last_modified(Post.objects.filter(**{lookup: value}))
+    for query in context.captured_queries[:2]:
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+            plan = "\n".join(row[-1] for row in cursor.fetchall())
+        assert "SEARCH blog_post USING COVERING INDEX" in plan, (
+            "Убедитесь, что время последней правки ленты берётся из"
+            f" индекса, без чтения публикаций. План запроса:\n{plan}"
+        )
@@ -0,0 +1,151 @@
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.images import ImageFile
+from django.core.files.storage import default_storage
+from django.core.management import CommandError, call_command
+from PIL import Image
+
+from blog.constants import IMAGE_JOB_MAX_ATTEMPTS, RENDITION_WIDTHS
+from blog.models import ImageJob, Post
+from blog.renditions import has_renditions, image_storage, rendition_name
+from blog.storage import ContentAddressedStorage
+from conftest import photo_file
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def queued_post(mixer, media_root, published_category):
+    return mixer.blend(
+        "blog.Post", category=published_category, is_published=True,
+        image=photo_file(),
+    )
+
+
+@pytest.fixture
+def post_with_photo(queued_post):
+    call_command("process_image_jobs", "--once", processes=1)
+    return queued_post
+
+
+def test_upload_only_enqueues_job(client, queued_post):
+    name = queued_post.image.name
+    assert ImageJob.objects.filter(name=name).exists(), (
+        "Убедитесь, что загрузка изображения ставит задание в очередь."
+    )
+    assert not has_renditions(name), (
+        "Убедитесь, что копии изображения не создаются во время запроса."
+    )
+    content = client.get("/").content.decode("utf-8")
+    assert queued_post.image.url in content and "srcset=" not in content
+
+
+def test_worker_processes_queue(client, queued_post, mixer):
+    assert "srcset=" not in client.get("/").content.decode("utf-8")
+    detail_url = f"/posts/{queued_post.id}/"
+    assert "srcset=" not in client.get(detail_url).content.decode("utf-8")
+    broken = mixer.blend(
+        "blog.Post", image=ImageFile(BytesIO(b"not an image"), name="x.jpg")
+    )
+    for _ in range(IMAGE_JOB_MAX_ATTEMPTS):
+        call_command("process_image_jobs", "--once", processes=1)
+    assert has_renditions(queued_post.image.name)
+    assert list(ImageJob.objects.values_list("name", "attempts")) == [
+        (broken.image.name, IMAGE_JOB_MAX_ATTEMPTS)
+    ], (
+        "Убедитесь, что обработанные задания удаляются из очереди, а"
+        " неудачные откладываются после нескольких попыток."
+    )
+    assert "srcset=" in client.get("/").content.decode("utf-8"), (
+        "Убедитесь, что после обработки закэшированная лента обновляется."
+    )
+    assert "srcset=" in client.get(detail_url).content.decode("utf-8")
+    updated_at = Post.objects.get(pk=queued_post.pk).updated_at
+    assert updated_at > queued_post.updated_at, (
+        "Убедитесь, что обработчик отмечает публикации изменёнными: по"
+        " времени изменения их страницы узнают о копиях в других процессах."
+    )
+
+    out = StringIO()
+    call_command("image_queue_stats", stdout=out)
+    assert "В очереди: 0" in out.getvalue()
+    assert "Отложено после ошибок: 1" in out.getvalue()
+
+
+def test_worker_refuses_local_memory_cache(settings):
+    settings.CACHES = {"default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }}
+    with pytest.raises(CommandError):
+        call_command("process_image_jobs", "--once", processes=1)
+
+
+def test_renditions_created_on_upload(post_with_photo):
+    for width in RENDITION_WIDTHS:
+        with image_storage().open(
+            rendition_name(post_with_photo.image.name, width)
+        ) as file:
+            image = Image.open(file)
+            assert image.format == "JPEG"
+            assert not image.getexif(), (
+                "Убедитесь, что в копиях изображения нет EXIF."
+            )
+            # Снимок повёрнут по EXIF: исходные 2000×1000 — это 1000×2000.
+            assert image.size == (
+                min(width, 1000), min(width, 1000) * 2
+            )
+
+
+def test_srcset_in_templates(client, post_with_photo):
+    for url in ("/", f"/posts/{post_with_photo.id}/"):
+        content = client.get(url).content.decode("utf-8")
+        assert f" {max(RENDITION_WIDTHS)}w" in content, (
+            "Убедитесь, что изображение публикации выводится с srcset."
+        )
+
+
+def test_srcset_falls_back_to_original(client, post_with_photo):
+    image_storage().delete(
+        rendition_name(post_with_photo.image.name, max(RENDITION_WIDTHS))
+    )
+    content = client.get("/").content.decode("utf-8")
+    assert "srcset=" not in content
+    assert post_with_photo.image.url in content
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_regenerate_renditions_command(post_with_photo, processes):
+    names = [
+        rendition_name(post_with_photo.image.name, width)
+        for width in RENDITION_WIDTHS
+    ]
+    for name in names:
+        image_storage().delete(name)
+    call_command(
+        "regenerate_renditions", "--missing", processes=processes
+    )
+    assert all(image_storage().exists(name) for name in names), (
+        "Убедитесь, что команда regenerate_renditions восстанавливает копии."
+    )
+
+
+def test_renditions_use_image_field_storage(
+        client, mixer, media_root, published_category, monkeypatch
+):
+    storage = ContentAddressedStorage(
+        location=media_root / "elsewhere", base_url="/elsewhere/"
+    )
+    monkeypatch.setattr(Post._meta.get_field("image"), "storage", storage)
+    post = mixer.blend(
+        "blog.Post", category=published_category, is_published=True,
+        image=photo_file(),
+    )
+    call_command("process_image_jobs", "--once", processes=1)
+    name = rendition_name(post.image.name, max(RENDITION_WIDTHS))
+    assert storage.exists(name) and not default_storage.exists(name), (
+        "Убедитесь, что копии изображения пишутся в хранилище поля image,"
+        " а не в хранилище по умолчанию."
+    )
+    content = client.get(f"/posts/{post.id}/").content.decode("utf-8")
+    assert f"/elsewhere/{name}" in content
@@ -0,0 +1,97 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+from blog import search
+from blog.search import FTS_TABLE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def searchable_posts(mixer, user, published_category):
+    return {
+        "cats": mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            is_published=True, title="Кошки и коты",
+            text="Про пушистых котов",
+        ),
+        "dogs": mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            is_published=True, title="Собаки", text="Один кот и собаки",
+        ),
+        "hidden": mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            is_published=False, title="Скрытые коты", text="Коты",
+        ),
+    }
+
+
+def _found(client, query):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == 200
+    return [post.id for post in response.context["page_obj"]]
+
+
+def test_search_ranks_and_respects_visibility(client, searchable_posts):
+    found = _found(client, "коты")
+    assert searchable_posts["hidden"].id not in found, (
+        "Убедитесь, что поиск не находит снятые с публикации записи."
+    )
+    assert found == [searchable_posts["cats"].id]
+    assert _found(client, "кот") == [
+        searchable_posts["cats"].id, searchable_posts["dogs"].id
+    ], "Убедитесь, что результаты поиска упорядочены по релевантности."
+
+
+def test_search_index_follows_edits(client, searchable_posts):
+    post = searchable_posts["dogs"]
+    post.title = "Попугаи"
+    post.text = "Разговорчивые птицы"
+    post.save()
+    assert _found(client, "попугаи") == [post.id]
+    assert _found(client, "собаки") == []
+    post.delete()
+    assert _found(client, "попугаи") == []
+
+
+@pytest.mark.parametrize("query", ['"', "AND OR NOT", "*", "(", ""])
+def test_search_survives_fts_syntax(client, searchable_posts, query):
+    assert _found(client, query) == []
+
+
+def test_admin_search(admin_client, searchable_posts):
+    response = admin_client.get("/admin/blog/post/", {"q": "коты"})
+    assert response.status_code == 200
+    assert {
+        post.id for post in response.context["cl"].result_list
+    } == {searchable_posts["cats"].id, searchable_posts["hidden"].id}
+
+
+def test_rebuild_search_index(client, searchable_posts):
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+    assert _found(client, "собаки") == []
+    call_command("rebuild_search_index")
+    assert _found(client, "собаки") == [searchable_posts["dogs"].id]
+    assert Post.objects.count() == 3
+
+
+def test_rebuild_search_index_inserts_in_batches(
+    client, searchable_posts, monkeypatch
+):
+    monkeypatch.setattr(search, "INDEX_BATCH_SIZE", 2)
+    with CaptureQueriesContext(connection) as context:
+        search.rebuild_index(Post.objects.all())
+    inserts = [
+        query for query in context.captured_queries
+        if query["sql"].startswith(f"INSERT INTO {FTS_TABLE}")
+    ]
+    assert len(inserts) == 2, (
+        "Убедитесь, что индекс наполняется пачками, а не по строке."
+    )
+    assert _found(client, "кот") == [
+        searchable_posts["cats"].id, searchable_posts["dogs"].id
+    ]
@@ -0,0 +1,87 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Count
+from django.utils import timezone
+
+from blog.models import Category, CategoryFeedEntry, Comment, Location, Post
+
+pytestmark = [pytest.mark.django_db]
+
+COUNTS = {
+    "--categories": 4, "--locations": 5, "--users": 30,
+    "--posts": 1200, "--comments": 2500,
+}
+
+
+def _seed(seed=7, processes=1):
+    args = [arg for pair in COUNTS.items() for arg in map(str, pair)]
+    call_command(
+        "seed_blog", *args, "--seed", str(seed),
+        "--processes", str(processes),
+        "--scheduled-share", "0.1",
+    )
+
+
+def _snapshot():
+    return (
+        list(Post.objects.order_by("pk").values_list(
+            "pk", "title", "author_id", "category_id", "is_published"
+        )),
+        list(Comment.objects.order_by("pk").values_list(
+            "pk", "post_id", "text"
+        )),
+    )
+
+
+def _wipe():
+    get_user_model().objects.all().delete()
+    Category.objects.all().delete()
+    Location.objects.all().delete()
+
+
+def test_seed_blog_counts_and_distributions():
+    _seed()
+    assert Post.objects.count() == 1200
+    assert Comment.objects.count() == 2500
+    now = timezone.now()
+    assert Post.objects.filter(pub_date__gt=now).count() == 120
+    assert not Comment.objects.filter(post__pub_date__gt=now).exists()
+    assert Post.objects.filter(is_published=False).exists()
+
+    authors = list(Post.objects.values("author").annotate(
+        total=Count("pk")
+    ).order_by("-total").values_list("total", flat=True))
+    assert authors[0] > 10 * authors[-1], (
+        "Убедитесь, что публикации распределены по авторам неравномерно."
+    )
+    hottest = Post.objects.order_by("-comment_count").first()
+    assert hottest.comment_count == hottest.comments.count() > 10
+    assert CategoryFeedEntry.objects.count() == Post.objects.filter(
+        is_published=True, category__is_published=True
+    ).count()
+
+
+def test_seed_blog_is_deterministic():
+    _seed()
+    first = _snapshot()
+    _wipe()
+    _seed()
+    assert _snapshot() == first, (
+        "Убедитесь, что с тем же зерном создаются те же данные."
+    )
+    _wipe()
+    _seed(seed=8)
+    assert _snapshot() != first
+
+
+def test_seed_blog_in_several_processes():
+    _seed()
+    first = _snapshot()
+    _wipe()
+    _seed(processes=3)
+    assert _snapshot() == first, (
+        "Убедитесь, что в несколько процессов база наполняется без ошибок "
+        "и теми же данными."
+    )
+    assert CategoryFeedEntry.objects.exists()
@@ -0,0 +1,89 @@
+import re
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+LOC_RE = re.compile(r"<loc>http://testserver(.+?)</loc>")
+
+
+@pytest.fixture
+def sitemap_settings(settings, tmp_path, monkeypatch):
+    settings.SITEMAP_CACHE_DIR = tmp_path
+    monkeypatch.setattr("blog.sitemaps.SITEMAP_CHUNK_SIZE", 4)
+    monkeypatch.setattr("blog.sitemaps.SITEMAP_BATCH_SIZE", 3)
+    return tmp_path
+
+
+def _get(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return b"".join(response.streaming_content).decode("utf-8")
+
+
+def _sitemap_locations(client):
+    locations = []
+    with CaptureQueriesContext(connection) as context:
+        for chunk_url in LOC_RE.findall(_get(client, "/sitemap.xml")):
+            locations += LOC_RE.findall(_get(client, chunk_url))
+    for query in context.captured_queries:
+        assert "OFFSET" not in query["sql"] and "COUNT(" not in query["sql"]
+    return locations
+
+
+def test_sitemap_lists_published_pages(
+        client, mixer, user, published_category, sitemap_settings
+):
+    now = timezone.now()
+    published = mixer.cycle(10).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=now - timedelta(days=1),
+    )
+    hidden = [
+        mixer.blend("blog.Post", author=user, is_published=False,
+                    category=published_category),
+        mixer.blend("blog.Post", author=user, category=published_category,
+                    pub_date=now + timedelta(days=1)),
+    ]
+    locations = _sitemap_locations(client)
+    assert sorted(loc for loc in locations if loc.startswith("/posts/")) == (
+        sorted(f"/posts/{post.id}/" for post in published)
+    ), (
+        "Убедитесь, что карта сайта перечисляет все опубликованные записи"
+        " и только их."
+    )
+    assert f"/posts/{hidden[0].id}/" not in locations
+    assert f"/category/{published_category.slug}/" in locations
+    assert f"/profile/{user.username}/" in locations
+
+
+def test_sitemap_chunks_cached_on_disk(
+        client, mixer, published_category, sitemap_settings
+):
+    post = mixer.blend(
+        "blog.Post", category=published_category, is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    url = f"/sitemap-posts-{post.id // 4}.xml"
+    _get(client, url)
+    (cached,) = sitemap_settings.rglob(f"posts-{post.id // 4}.xml")
+    mtime = cached.stat().st_mtime
+    _get(client, url)
+    assert cached.stat().st_mtime == mtime, (
+        "Убедитесь, что неизменившийся кусок карты сайта берётся с диска."
+    )
+
+    post.is_published = False
+    post.save()
+    assert f"/posts/{post.id}/" not in _get(client, url), (
+        "Убедитесь, что кусок карты сайта перестраивается после изменений."
+    )
+
+
+def test_unknown_sitemap_chunk_not_found(client, sitemap_settings):
+    assert client.get("/sitemap-posts-999.xml").status_code == 404
+    assert client.get("/sitemap-unknown-0.xml").status_code == 404
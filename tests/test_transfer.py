@@ -0,0 +1,126 @@
+import gzip
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from blog import transfer
+from blog.feed_counts import feed_count_key
+from blog.models import Category, CategoryFeedEntry, Comment, Location, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def blog_data(mixer, user, published_category, published_location):
+    now = timezone.now()
+    posts = mixer.cycle(5).blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location, is_published=True,
+        pub_date=now - timedelta(hours=1),
+    )
+    for hours in (3, 2):
+        mixer.blend(
+            "blog.Comment", post=posts[0], author=user,
+            created_at=now - timedelta(hours=hours),
+        )
+    return posts
+
+
+def _lines(directory, model):
+    with gzip.open(transfer.data_path(directory, model), "rt") as file:
+        return [json.loads(line) for line in file]
+
+
+def test_export_import_round_trip(blog_data, tmp_path):
+    call_command("export_blog", tmp_path, "--batch-size", "2")
+    created = list(Comment.objects.order_by("pk").values_list(
+        "created_at", flat=True
+    ))
+    Post.objects.all().delete()
+    Category.objects.all().delete()
+    Location.objects.all().delete()
+
+    call_command("import_blog", tmp_path, "--batch-size", "2")
+    assert Post.objects.count() == len(blog_data)
+    assert list(Comment.objects.order_by("pk").values_list(
+        "created_at", flat=True
+    )) == created, (
+        "Убедитесь, что при загрузке сохраняется время создания строк."
+    )
+    assert Post.objects.get(pk=blog_data[0].pk).comment_count == 2
+    assert CategoryFeedEntry.objects.count() == len(blog_data), (
+        "Убедитесь, что загрузка обновляет ленты категорий."
+    )
+
+    # Повторная загрузка обновляет строки, а не дублирует их.
+    call_command("import_blog", tmp_path, "--batch-size", "2")
+    assert Post.objects.count() == len(blog_data)
+
+
+def test_import_leaves_fields_and_forgets_counts(
+    blog_data, tmp_path, monkeypatch
+):
+    call_command("export_blog", tmp_path)
+    Post.objects.all().delete()
+    flags = []
+    original = QuerySet.bulk_create
+
+    def checking_bulk_create(self, *args, **kwargs):
+        flags.append(Comment._meta.get_field("created_at").auto_now_add)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(QuerySet, "bulk_create", checking_bulk_create)
+    cache.set(feed_count_key("index"), 999)
+    cache.set(feed_count_key("author", blog_data[0].author_id, "all"), 999)
+
+    call_command("import_blog", tmp_path)
+    assert flags and all(flags), (
+        "Убедитесь, что загрузка не меняет настройки полей модели: "
+        "они общие для всех потоков процесса."
+    )
+    assert cache.get(feed_count_key("index")) is None, (
+        "Убедитесь, что после загрузки счётчики лент сбрасываются."
+    )
+    assert cache.get(
+        feed_count_key("author", blog_data[0].author_id, "all")
+    ) is None, "Убедитесь, что после загрузки сбрасываются счётчики авторов."
+
+
+def test_export_since(blog_data, tmp_path):
+    moment = timezone.now()
+    Post.objects.filter(pk=blog_data[1].pk).update(is_published=False)
+    call_command("export_blog", tmp_path, "--since", moment.isoformat())
+    assert [row["id"] for row in _lines(tmp_path, Post)] == [
+        blog_data[1].pk
+    ]
+    assert _lines(tmp_path, Category) == []
+
+
+def test_export_resumes_after_failure(blog_data, tmp_path, monkeypatch):
+    saves = []
+
+    def failing_save(path, state):
+        saves.append(path)
+        written = state["models"].get("blog.post", {}).get("rows", 0)
+        if written == 2:
+            # Сбой после записи следующей пачки, до контрольной точки.
+            with gzip.open(transfer.data_path(tmp_path, Post), "at") as file:
+                file.write('{"id": 0}\n')
+            raise RuntimeError
+        original(path, state)
+
+    original = transfer.write_checkpoint
+    monkeypatch.setattr(transfer, "write_checkpoint", failing_save)
+    with pytest.raises(RuntimeError):
+        call_command("export_blog", tmp_path, "--batch-size", "2")
+    monkeypatch.setattr(transfer, "write_checkpoint", original)
+
+    call_command("export_blog", tmp_path, "--batch-size", "2", "--resume")
+    assert [row["id"] for row in _lines(tmp_path, Post)] == sorted(
+        post.pk for post in blog_data
+    ), "Убедитесь, что продолженная выгрузка не теряет и не дублирует строк."
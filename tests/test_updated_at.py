@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Category, Comment, Location, Post
+from blog.paginators import iter_batches
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.mark.parametrize("model", [Category, Comment, Location, Post])
+def test_updated_at_maintained(mixer, model):
+    objects = mixer.cycle(3).blend(model)
+    moment = timezone.now()
+    assert not model.objects.changed_since(moment).exists()
+
+    saved, updated, _ = objects
+    saved.is_published = not saved.is_published
+    saved.save()
+    model.objects.filter(pk=updated.pk).update(is_published=False)
+    assert list(model.objects.changed_since(moment)) == [saved, updated], (
+        "Убедитесь, что updated_at меняется и при save(), и при"
+        " queryset.update()."
+    )
+
+
+def test_category_list_editable_touches_updated_at(admin_client, mixer):
+    category = mixer.blend("blog.Category", is_published=True)
+    moment = timezone.now()
+    response = admin_client.post("/admin/blog/category/", {
+        "form-TOTAL_FORMS": 1,
+        "form-INITIAL_FORMS": 1,
+        "form-0-id": category.id,
+        "_save": "Сохранить",
+    })
+    assert response.status_code == 302
+    assert list(Category.objects.changed_since(moment)) == [category]
+
+
+def test_iter_batches_walks_changes(mixer):
+    posts = mixer.cycle(7).blend("blog.Post")
+    now = timezone.now()
+    Post.objects.filter(pk__in=[post.pk for post in posts[:4]]).update(
+        updated_at=now + timedelta(minutes=1)
+    )
+    batches = list(iter_batches(
+        Post.objects.changed_since(now).values("id", "updated_at"), 3,
+        field="updated_at",
+    ))
+    assert [len(batch) for batch in batches] == [3, 1]
+    assert [row["id"] for batch in batches for row in batch] == [
+        post.pk for post in posts[:4]
+    ]
+    assert [
+        post.pk for batch in iter_batches(Post.objects.all(), 2)
+        for post in batch
+    ] == sorted(post.pk for post in posts)
@@ -0,0 +1,44 @@
+import pytest
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def hidden_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False,
+    )
+
+
+def test_visible_to(user, another_user, hidden_post,
+                    post_of_another_author):
+    assert set(Post.objects.visible_to(user)) == {
+        hidden_post, post_of_another_author
+    }
+    assert set(Post.objects.visible_to(another_user)) == {
+        post_of_another_author
+    }
+
+
+def test_hidden_post_detail(
+        user_client, another_user_client, unlogged_client, hidden_post
+):
+    url = f"/posts/{hidden_post.id}/"
+    assert user_client.get(url).status_code == 200, (
+        "Убедитесь, что автор видит свою снятую с публикации запись."
+    )
+    assert another_user_client.get(url).status_code == 404
+    assert unlogged_client.get(url).status_code == 404
+
+
+def test_hidden_post_not_in_foreign_profile(
+        user, another_user_client, hidden_post
+):
+    response = another_user_client.get(f"/profile/{user.username}/")
+    assert hidden_post not in response.context["page_obj"], (
+        "Убедитесь, что на странице пользователя другим посетителям не видны"
+        " его снятые с публикации записи."
+    )